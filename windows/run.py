@@ -5,42 +5,64 @@ Main entry point for Google Media Backup Windows application.
 import sys
 import os
 import json
+import atexit
+import subprocess
+import time
 import traceback
 from pathlib import Path
 from datetime import datetime
 
-# Add src to path
+# The app lives in the `src` package next to this script; the script's own
+# directory is already on sys.path, so no path manipulation is needed
 script_dir = Path(__file__).parent
-sys.path.insert(0, str(script_dir / "src"))
 
-# Set up startup logging
-appdata = os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming")
-log_dir = Path(appdata) / "GoogleMediaBackup"
-log_dir.mkdir(parents=True, exist_ok=True)
-startup_log = log_dir / "startup.log"
+# App data directory, resolved once at import
+APPDATA_DIR = Path(os.environ.get("APPDATA") or (Path.home() / "AppData" / "Roaming")) / "GoogleMediaBackup"
+APPDATA_DIR.mkdir(parents=True, exist_ok=True)
 
-def log(message):
+# Set up startup logging
+startup_log = APPDATA_DIR / "startup.log"
+setup_complete_file = os.path.join(str(APPDATA_DIR), "setup_complete.json")
+
+# Keep one buffered handle open for the whole process instead of
+# reopening the startup log on every call
+try:
+    _log_fh = open(startup_log, "a", encoding="utf-8", buffering=1 << 16)
+    atexit.register(_log_fh.close)
+except Exception:
+    _log_fh = None
+
+def log(message, flush=False):
     """Write to startup log with timestamp."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    t = time.time()
+    ms = int((t - int(t)) * 1000)
+    timestamp = f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t))}.{ms:03d}"
     line = f"[{timestamp}] run.py: {message}\n"
-    try:
-        with open(startup_log, "a", encoding="utf-8") as f:
-            f.write(line)
-    except Exception:
-        pass
+    if _log_fh is not None:
+        try:
+            _log_fh.write(line)
+            if flush:
+                _log_fh.flush()
+        except Exception:
+            pass
     print(f"{timestamp} {message}")
 
 
 def is_setup_complete() -> bool:
     """Check if setup has been completed."""
-    setup_file = log_dir / "setup_complete.json"
-    return setup_file.exists()
+    if not os.path.isfile(setup_complete_file):
+        return False
 
+    # Reject partial or corrupt marker files
+    try:
+        with open(setup_complete_file, "r", encoding="utf-8") as f:
+            return json.load(f).get("setup_complete") is True
+    except Exception:
+        return False
 
-def run_setup():
-    """Run the setup script with a visible console."""
-    import subprocess
 
+def run_setup():
+    """Run the setup script in its own console window."""
     setup_script = script_dir / "setup.py"
 
     # Use python.exe (not pythonw.exe) so the console is visible
@@ -48,7 +70,13 @@ def run_setup():
     if python_exe.lower().endswith("pythonw.exe"):
         python_exe = python_exe[:-5] + ".exe"  # pythonw.exe -> python.exe
 
-    subprocess.run([python_exe, str(setup_script)])
+    # Give setup its own console so its output doesn't go through our stdio
+    process = subprocess.Popen(
+        [python_exe, str(setup_script)],
+        creationflags=getattr(subprocess, "CREATE_NEW_CONSOLE", 0),
+        close_fds=True
+    )
+    process.wait()
 
 
 def main():
@@ -56,14 +84,16 @@ def main():
     log("main() started")
 
     # Check if setup is needed
-    log(f"Checking setup status...")
-    if not is_setup_complete():
+    log("Checking setup status...")
+    setup_done = is_setup_complete()
+    if not setup_done:
         log("First run detected. Running setup...")
         run_setup()
 
         # Check again after setup
-        if not is_setup_complete():
-            log("Setup was not completed. Please run SETUP.bat")
+        setup_done = is_setup_complete()
+        if not setup_done:
+            log("Setup was not completed. Please run SETUP.bat", flush=True)
             sys.exit(1)
 
     log("Setup is complete, starting app...")
@@ -71,7 +101,7 @@ def main():
     # Import and run the app
     try:
         log("Importing app module...")
-        from app import get_app
+        from src.app import get_app
 
         log("Creating app instance...")
         app = get_app()
@@ -82,19 +112,23 @@ def main():
         log("app.run() returned normally")
 
     except ImportError as e:
-        log(f"IMPORT ERROR: {e}\n{traceback.format_exc()}")
+        log(f"IMPORT ERROR: {e}\n{traceback.format_exc()}", flush=True)
         print("Try running SETUP.bat to install dependencies.")
         sys.exit(1)
     except Exception as e:
-        log(f"CRASH: {type(e).__name__}: {e}\n{traceback.format_exc()}")
-
-        # Write to crash log
-        crash_log = log_dir / "crash.log"
-        with open(crash_log, "a", encoding="utf-8") as f:
-            f.write(f"\n{'=' * 50}\n")
-            f.write(f"Crash at: {datetime.now().isoformat()}\n")
-            f.write(f"{type(e).__name__}: {e}\n")
-            f.write(traceback.format_exc())
+        tb = traceback.format_exc()
+        log(f"CRASH: {type(e).__name__}: {e}\n{tb}", flush=True)
+
+        # Write to crash log as a single record
+        crash_log = APPDATA_DIR / "crash.log"
+        payload = (
+            f"\n{'=' * 50}\n"
+            f"Crash at: {datetime.now().isoformat()}\n"
+            f"{type(e).__name__}: {e}\n"
+            f"{tb}"
+        )
+        with open(crash_log, "a", encoding="utf-8", buffering=1 << 16) as f:
+            f.write(payload)
 
         sys.exit(1)
 
@@ -33,8 +33,6 @@ with open(startup_log, "w", encoding="utf-8") as f:
     f.write(f"=" * 50 + "\n\n")
 
 try:
-    log("Adding src to path...")
-    sys.path.insert(0, str(script_dir / "src"))
     log(f"sys.path: {sys.path[:3]}")
 
     log("Importing run module...")
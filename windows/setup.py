@@ -13,6 +13,10 @@ import urllib.request
 from pathlib import Path
 
 
+# App data directory, resolved once at import
+APPDATA_DIR = Path(os.environ.get("APPDATA") or (Path.home() / "AppData" / "Roaming")) / "GoogleMediaBackup"
+
+
 def is_admin():
     """Check if running with admin privileges."""
     try:
@@ -55,22 +59,28 @@ def install_dependencies():
         return False
 
     try:
-        # Upgrade pip first
+        # Upgrade pip on its own, since --upgrade would also apply to every
+        # requirement; pip writes straight to the console
         subprocess.run(
-            [sys.executable, "-m", "pip", "install", "--upgrade", "pip"],
-            capture_output=True,
+            [
+                sys.executable, "-m", "pip", "install",
+                "--upgrade", "pip",
+                "--disable-pip-version-check", "-q"
+            ],
             check=False
         )
 
-        # Install requirements
         result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", str(requirements_file), "-q"],
-            capture_output=True,
-            text=True
+            [
+                sys.executable, "-m", "pip", "install",
+                "-r", str(requirements_file),
+                "--disable-pip-version-check", "-q"
+            ],
+            check=False
         )
 
         if result.returncode != 0:
-            print(f"  Warning: Some packages may have issues: {result.stderr[:200]}")
+            print(f"  Warning: Some packages may have issues (pip exited with {result.returncode})")
 
         print("  Dependencies installed - OK")
         return True
@@ -80,9 +90,25 @@ def install_dependencies():
         return False
 
 
+def get_cached_ffmpeg_path():
+    """Get the ffmpeg path recorded by a previous setup run, if still valid."""
+    setup_file = APPDATA_DIR / "setup_complete.json"
+
+    try:
+        with open(setup_file, "r") as f:
+            cached_path = json.load(f).get("ffmpeg_path")
+    except Exception:
+        return None
+
+    if cached_path and os.path.isfile(cached_path):
+        return cached_path
+    return None
+
+
 def check_ffmpeg():
     """Check if ffmpeg is available, offer to install via winget."""
-    if shutil.which("ffmpeg"):
+    # Reuse the path found by a previous setup run to skip the PATH scan
+    if get_cached_ffmpeg_path() or shutil.which("ffmpeg"):
         print("  ffmpeg found - OK")
         return True
 
@@ -111,12 +137,10 @@ def check_ffmpeg():
 
 def create_config_directory():
     """Create the configuration directory."""
-    appdata = os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming")
-    config_dir = Path(appdata) / "GoogleMediaBackup"
+    config_dir = APPDATA_DIR
     state_dir = config_dir / "state"
 
     try:
-        config_dir.mkdir(parents=True, exist_ok=True)
         state_dir.mkdir(parents=True, exist_ok=True)
         print(f"  Config directory created - OK")
         return config_dir
@@ -169,17 +193,29 @@ $Shortcut.WindowStyle = 1
 
         ps_script += '$Shortcut.Save()'
 
-        result = subprocess.run(
-            ["powershell", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-            capture_output=True,
-            text=True
-        )
+        # Run the script from a file, skipping the user's PowerShell profile.
+        # Windows PowerShell 5.1 reads BOM-less scripts as ANSI, so write a
+        # BOM to keep non-ASCII paths intact.
+        ps_file = script_dir / ".shortcut.ps1"
+        with open(ps_file, "w", encoding="utf-8-sig") as f:
+            f.write(ps_script)
+
+        try:
+            result = subprocess.run(
+                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", str(ps_file)],
+                check=False
+            )
+        finally:
+            try:
+                ps_file.unlink()
+            except Exception:
+                pass
 
         if result.returncode == 0 or shortcut_path.exists():
             print(f"  Desktop shortcut created - OK")
             return True
         else:
-            print(f"  Warning: Could not create shortcut: {result.stderr[:100]}")
+            print(f"  Warning: Could not create shortcut (PowerShell exited with {result.returncode})")
             return False
 
     except Exception as e:
@@ -188,7 +224,7 @@ $Shortcut.WindowStyle = 1
 
 
 def create_app_icon():
-    """Create a simple app icon if none exists."""
+    """Install the app icon from the bundled default if none exists."""
     script_dir = Path(__file__).parent
     resources_dir = script_dir / "resources"
     icon_path = resources_dir / "icon.ico"
@@ -196,35 +232,13 @@ def create_app_icon():
     if icon_path.exists():
         return True
 
-    try:
-        resources_dir.mkdir(parents=True, exist_ok=True)
-
-        # Try to use PIL to create a simple icon
-        try:
-            from PIL import Image, ImageDraw
-
-            # Create a simple cloud icon
-            size = 256
-            img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-
-            # Blue cloud shape
-            color = (66, 133, 244, 255)
-            # Draw overlapping circles for cloud effect
-            draw.ellipse([40, 100, 140, 200], fill=color)
-            draw.ellipse([100, 80, 220, 200], fill=color)
-            draw.ellipse([160, 100, 240, 200], fill=color)
-            draw.rectangle([60, 140, 220, 200], fill=color)
-
-            # Save as ICO with multiple sizes
-            img.save(icon_path, format="ICO", sizes=[(16, 16), (32, 32), (48, 48), (256, 256)])
-            print("  App icon created - OK")
-            return True
-
-        except ImportError:
-            # PIL not available yet, will be created after dependencies install
-            pass
+    # The icon is constant, so ship it pre-rendered instead of drawing it here
+    default_icon = resources_dir / "icon_default.ico"
 
+    try:
+        shutil.copy(default_icon, icon_path)
+        print("  App icon created - OK")
+        return True
     except Exception:
         pass
 
@@ -233,16 +247,20 @@ def create_app_icon():
 
 def mark_setup_complete():
     """Mark setup as complete."""
-    appdata = os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming")
-    setup_file = Path(appdata) / "GoogleMediaBackup" / "setup_complete.json"
+    setup_file = APPDATA_DIR / "setup_complete.json"
+    tmp_file = setup_file.with_suffix(".json.tmp")
 
     try:
-        with open(setup_file, "w") as f:
+        # Write to a temp file and swap it in so an interrupted write
+        # never leaves a partial setup_complete.json behind
+        with open(tmp_file, "w", encoding="utf-8") as f:
             json.dump({
                 "setup_complete": True,
                 "version": "1.0.0",
-                "python_path": sys.executable
+                "python_path": sys.executable,
+                "ffmpeg_path": shutil.which("ffmpeg")
             }, f, indent=2)
+        os.replace(tmp_file, setup_file)
         return True
     except Exception:
         return False
@@ -5,10 +5,10 @@ Coordinates all components and manages application lifecycle.
 
 import os
 import sys
-import subprocess
+import logging
+import queue
 import threading
-from pathlib import Path
-from typing import Optional
+from typing import Optional, Callable
 
 try:
     import customtkinter as ctk
@@ -17,20 +17,14 @@ except ImportError:
     import tkinter as tk
     CTK_AVAILABLE = False
 
-from core.google_auth import get_auth_manager
-from core.drive_client import get_drive_client
-from core.photos_client import get_photos_client
-from core.download_manager import get_download_manager
-from core.transcription import get_transcription_manager
+# Core managers (Google API client, transcription) and secondary dialogs are
+# imported lazily so they don't delay the main window appearing
 # from ui.system_tray import get_system_tray  # Not used - Windows uses main window
-from ui.main_window import get_main_window
-from ui.auth_window import show_auth_dialog
-from ui.config_window import show_config_dialog
-from ui.progress_dialog import show_progress
-from utils.config import get_config_manager
-from utils.paths import Paths
-from utils.logger import get_logger
-from utils.notifications import (
+from .ui.main_window import get_main_window
+from .utils.config import get_config_manager
+from .utils.paths import Paths
+from .utils.logger import get_logger
+from .utils.notifications import (
     notify_signed_in,
     notify_sign_in_required,
     notify_download_stopped,
@@ -46,33 +40,69 @@ class GoogleMediaBackupApp:
     def __init__(self):
         self._root: Optional[ctk.CTk] = None
         self._is_running = False
-
-        # Get component instances
-        self._auth_manager = get_auth_manager()
-        self._download_manager = get_download_manager()
-        self._transcription_manager = get_transcription_manager()
+        self._state_update_pending = False
+
+        # Single background worker reused for scan/download requests. It's a
+        # daemon thread, so a scan still running at quit doesn't keep the
+        # process alive.
+        self._bg_tasks: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue()
+        self._bg_thread: Optional[threading.Thread] = None
+
+        # Core managers are created on first access (see the properties
+        # below) so they don't delay the main window appearing
+        self._auth_manager_instance = None
+        self._download_manager_instance = None
+        self._transcription_manager_instance = None
         self._main_window = get_main_window()
         self._config_manager = get_config_manager()
 
         # Setup callbacks
         self._setup_callbacks()
 
+    @property
+    def _auth_manager(self):
+        """Get the auth manager, creating and wiring it on first use."""
+        if self._auth_manager_instance is None:
+            from .core.google_auth import get_auth_manager
+
+            self._auth_manager_instance = get_auth_manager()
+            self._auth_manager_instance.set_auth_change_callback(self._on_auth_changed)
+        return self._auth_manager_instance
+
+    @property
+    def _download_manager(self):
+        """Get the download manager, creating and wiring it on first use."""
+        if self._download_manager_instance is None:
+            from .core.download_manager import get_download_manager
+
+            manager = get_download_manager()
+            manager.set_progress_callback(self._on_download_progress)
+            manager.set_file_complete_callback(self._on_file_complete)
+            manager.set_download_complete_callback(self._on_download_complete)
+            manager.set_error_callback(self._on_download_error)
+            self._download_manager_instance = manager
+        return self._download_manager_instance
+
+    @property
+    def _transcription_manager(self):
+        """Get the transcription manager, creating and wiring it on first use."""
+        if self._transcription_manager_instance is None:
+            from .core.transcription import get_transcription_manager
+
+            manager = get_transcription_manager()
+            manager.set_progress_callback(self._on_transcription_progress)
+            manager.set_complete_callback(self._on_transcription_complete)
+            manager.set_error_callback(self._on_transcription_error)
+            self._transcription_manager_instance = manager
+        return self._transcription_manager_instance
+
+    def _is_transcribing(self) -> bool:
+        """Check for a running transcription without creating the manager."""
+        manager = self._transcription_manager_instance
+        return manager is not None and manager.is_transcribing
+
     def _setup_callbacks(self) -> None:
         """Set up callbacks between components."""
-        # Auth callbacks
-        self._auth_manager.set_auth_change_callback(self._on_auth_changed)
-
-        # Download manager callbacks
-        self._download_manager.set_progress_callback(self._on_download_progress)
-        self._download_manager.set_file_complete_callback(self._on_file_complete)
-        self._download_manager.set_download_complete_callback(self._on_download_complete)
-        self._download_manager.set_error_callback(self._on_download_error)
-
-        # Transcription callbacks
-        self._transcription_manager.set_progress_callback(self._on_transcription_progress)
-        self._transcription_manager.set_complete_callback(self._on_transcription_complete)
-        self._transcription_manager.set_error_callback(self._on_transcription_error)
-
         # Main window callbacks
         self._main_window.set_callbacks(
             on_sign_in=self._handle_sign_in,
@@ -93,13 +123,10 @@ class GoogleMediaBackupApp:
         logger.info("Starting Google Media Backup")
         logger.info(f"CTK_AVAILABLE: {CTK_AVAILABLE}")
 
-        # Ensure directories exist
+        # Ensure directories exist in the background while the window is built
         logger.info("Ensuring directories exist...")
-        Paths.ensure_all_directories()
-
-        # Initialize state
-        logger.info("Initializing state...")
-        self._update_state()
+        dirs_thread = threading.Thread(target=Paths.ensure_all_directories, daemon=True)
+        dirs_thread.start()
 
         # Show main window on startup (Windows UX - visible in taskbar)
         logger.info("Showing main window...")
@@ -109,6 +136,13 @@ class GoogleMediaBackupApp:
         self._root = self._main_window.window
         logger.info("Main window shown")
 
+        # State is read from disk below, so the directories must exist by now
+        dirs_thread.join()
+
+        # Initialize state
+        logger.info("Initializing state...")
+        self._update_state()
+
         # Override close behavior - minimize to taskbar instead of quit
         if self._root:
             self._root.protocol("WM_DELETE_WINDOW", self._handle_window_close)
@@ -119,6 +153,11 @@ class GoogleMediaBackupApp:
             logger.info("Auto-download enabled, scheduling...")
             self._root.after(1000, self._handle_start_download)
 
+        # Signed out: warm up the OAuth imports before the user clicks sign in
+        if not self._auth_manager.is_authenticated:
+            from .ui.auth_window import preload_in_background
+            preload_in_background()
+
         # Run the main loop
         logger.info("Entering main loop...")
         self._is_running = True
@@ -134,7 +173,7 @@ class GoogleMediaBackupApp:
 
     def _handle_window_close(self) -> None:
         """Handle window close button - ask to quit or minimize."""
-        if self._download_manager.is_downloading or self._transcription_manager.is_transcribing:
+        if self._download_manager.is_downloading or self._is_transcribing():
             # If work in progress, ask what to do
             from tkinter import messagebox
             result = messagebox.askyesnocancel(
@@ -159,10 +198,35 @@ class GoogleMediaBackupApp:
 
         # Stop downloads/transcriptions
         self._download_manager.stop_download()
-        self._transcription_manager.stop_transcription()
+        self._download_manager.shutdown()
+        if self._transcription_manager_instance is not None:
+            self._transcription_manager_instance.stop_transcription()
+        self._bg_tasks.put(None)
 
         self._is_running = False
 
+    def _run_in_background(self, task: Callable[[], None]) -> None:
+        """Queue a task for the background worker, starting it on first use."""
+        if self._bg_thread is None:
+            self._bg_thread = threading.Thread(
+                target=self._background_worker,
+                name="gmb-bg",
+                daemon=True
+            )
+            self._bg_thread.start()
+        self._bg_tasks.put(task)
+
+    def _background_worker(self) -> None:
+        """Run queued tasks one at a time until a None sentinel is queued."""
+        while True:
+            task = self._bg_tasks.get()
+            if task is None:
+                return
+            try:
+                task()
+            except Exception as e:
+                logger.error(f"Background task failed: {e}", exc_info=True)
+
     def _update_state(self) -> None:
         """Update component states."""
         is_auth = self._auth_manager.is_authenticated
@@ -175,35 +239,55 @@ class GoogleMediaBackupApp:
             is_authenticated=is_auth,
             is_downloading=is_downloading,
             is_paused=is_paused,
-            is_transcribing=self._transcription_manager.is_transcribing,
+            is_transcribing=self._is_transcribing(),
             stats=stats
         )
 
+    def _request_state_update(self) -> None:
+        """Schedule a state update, coalescing bursts into one UI refresh."""
+        if self._root is None:
+            self._update_state()
+            return
+
+        if self._state_update_pending:
+            return
+
+        self._state_update_pending = True
+        self._root.after_idle(self._flush_state_update)
+
+    def _flush_state_update(self) -> None:
+        """Run a scheduled state update."""
+        self._state_update_pending = False
+        self._update_state()
+
     # Auth callbacks
     def _on_auth_changed(self, is_authenticated: bool) -> None:
         """Handle authentication state change."""
         if is_authenticated:
+            from .core.drive_client import get_drive_client
+
             notify_signed_in()
-            # Invalidate cached services
+            # Invalidate cached services (the Photos client uses the auth
+            # manager's session, which follows the new credentials itself)
             get_drive_client().invalidate_service()
-            get_photos_client().invalidate_service()
 
-        self._update_state()
+        self._request_state_update()
 
     # Download callbacks
     def _on_download_progress(self, filename: str, current: int, total: int) -> None:
         """Handle download progress update."""
-        logger.debug(f"Downloading {filename}: {current}%")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Downloading %s: %d%%", filename, current)
 
     def _on_file_complete(self, file_state) -> None:
         """Handle file download completion."""
         logger.info(f"Downloaded: {file_state.name}")
-        self._update_state()
+        self._request_state_update()
 
     def _on_download_complete(self, stats) -> None:
         """Handle all downloads completion."""
         logger.info(f"Download complete: {stats.downloaded} files")
-        self._update_state()
+        self._request_state_update()
 
         # Auto-transcribe if enabled
         config = self._config_manager.get_config()
@@ -219,12 +303,13 @@ class GoogleMediaBackupApp:
     # Transcription callbacks
     def _on_transcription_progress(self, filename: str, progress: float) -> None:
         """Handle transcription progress."""
-        logger.debug(f"Transcribing {filename}: {progress:.0%}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Transcribing %s: %.0f%%", filename, progress * 100)
 
     def _on_transcription_complete(self, video_path: str, transcript_path: str) -> None:
         """Handle transcription completion."""
         logger.info(f"Transcribed: {video_path}")
-        self._update_state()
+        self._request_state_update()
 
     def _on_transcription_error(self, video_path: str, error: str) -> None:
         """Handle transcription error."""
@@ -233,15 +318,17 @@ class GoogleMediaBackupApp:
     # UI action handlers
     def _handle_sign_in(self) -> None:
         """Handle sign in request."""
+        from .ui.auth_window import show_auth_dialog
+
         def on_complete(success: bool, message: str):
-            self._update_state()
+            self._request_state_update()
 
         show_auth_dialog(self._root, on_complete)
 
     def _handle_sign_out(self) -> None:
         """Handle sign out request."""
         self._auth_manager.sign_out()
-        self._update_state()
+        self._request_state_update()
 
     def _handle_start_download(self) -> None:
         """Handle start download request."""
@@ -249,6 +336,11 @@ class GoogleMediaBackupApp:
             notify_sign_in_required()
             return
 
+        # With auto-transcribe on, a batch follows the downloads; load the
+        # model while they run
+        if self._config_manager.get_config().auto_transcribe:
+            self._transcription_manager.prewarm_model()
+
         # Scan and download in background
         def scan_and_download():
             try:
@@ -256,40 +348,38 @@ class GoogleMediaBackupApp:
                 if self._root:
                     self._root.after(0, lambda: self._show_scan_progress())
 
-                # Scan sources
-                self._download_manager.scan_sources()
+                # Scan sources; each source starts downloading as soon as its
+                # scan finishes instead of waiting for the other one
+                self._download_manager.scan_sources(download_as_ready=True)
 
                 # Hide progress
                 if self._root:
                     self._root.after(0, lambda: self._hide_scan_progress())
 
-                # Start download
-                self._download_manager.start_download()
-                self._update_state()
+                self._request_state_update()
 
             except Exception as e:
                 logger.error(f"Error starting download: {e}")
                 if self._root:
                     self._root.after(0, lambda: self._hide_scan_progress())
 
-        thread = threading.Thread(target=scan_and_download, daemon=True)
-        thread.start()
+        self._run_in_background(scan_and_download)
 
     def _handle_stop_download(self) -> None:
         """Handle stop download request."""
         self._download_manager.stop_download()
         notify_download_stopped()
-        self._update_state()
+        self._request_state_update()
 
     def _handle_pause_download(self) -> None:
         """Handle pause download request."""
         self._download_manager.pause_download()
-        self._update_state()
+        self._request_state_update()
 
     def _handle_resume_download(self) -> None:
         """Handle resume download request."""
         self._download_manager.resume_download()
-        self._update_state()
+        self._request_state_update()
 
     def _handle_scan(self) -> None:
         """Handle scan sources request."""
@@ -303,7 +393,7 @@ class GoogleMediaBackupApp:
                     self._root.after(0, lambda: self._show_scan_progress())
 
                 self._download_manager.scan_sources()
-                self._update_state()
+                self._request_state_update()
 
             except Exception as e:
                 logger.error(f"Error scanning: {e}")
@@ -311,40 +401,40 @@ class GoogleMediaBackupApp:
                 if self._root:
                     self._root.after(0, lambda: self._hide_scan_progress())
 
-        thread = threading.Thread(target=scan, daemon=True)
-        thread.start()
+        self._run_in_background(scan)
 
     def _handle_transcribe(self) -> None:
         """Handle transcribe request."""
         self._transcription_manager.transcribe_all_pending()
-        self._update_state()
+        self._request_state_update()
 
     def _handle_stop_transcription(self) -> None:
         """Handle stop transcription request."""
-        self._transcription_manager.stop_transcription()
+        if self._transcription_manager_instance is not None:
+            self._transcription_manager_instance.stop_transcription()
         notify_transcription_stopped()
-        self._update_state()
+        self._request_state_update()
 
     def _handle_open_folder(self) -> None:
         """Handle open folder request."""
         config = self._config_manager.get_config()
-        folder = Path(config.download_path)
+        folder = config.download_path
 
-        if not folder.exists():
-            folder.mkdir(parents=True, exist_ok=True)
+        if not os.path.isdir(folder):
+            os.makedirs(folder, exist_ok=True)
 
         # Open in Windows Explorer
         try:
-            os.startfile(str(folder))
-        except Exception as e:
+            os.startfile(folder)
+        except OSError as e:
             logger.error(f"Failed to open folder: {e}")
-            # Fallback
-            subprocess.run(["explorer", str(folder)], check=False)
 
     def _handle_preferences(self) -> None:
         """Handle preferences request."""
+        from .ui.config_window import show_config_dialog
+
         def on_save(config):
-            self._update_state()
+            self._request_state_update()
 
         show_config_dialog(self._root, on_save)
 
@@ -363,7 +453,7 @@ class GoogleMediaBackupApp:
                     return
             except Exception:
                 pass  # Continue with quit if dialog fails
-        elif self._transcription_manager.is_transcribing:
+        elif self._is_transcribing():
             try:
                 from tkinter import messagebox
                 result = messagebox.askyesno(
@@ -384,6 +474,8 @@ class GoogleMediaBackupApp:
 
     def _show_scan_progress(self) -> None:
         """Show scanning progress dialog."""
+        from .ui.progress_dialog import show_progress
+
         self._progress_dialog = show_progress(
             self._root,
             "Scanning...",
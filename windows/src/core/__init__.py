@@ -1,6 +1,3 @@
 # Core components
-from .google_auth import GoogleAuthManager, get_auth_manager
-from .drive_client import DriveClient, get_drive_client
-from .photos_client import PhotosClient, get_photos_client
-from .download_manager import DownloadManager, get_download_manager
-from .transcription import TranscriptionManager, get_transcription_manager
+# Import submodules directly (e.g. src.core.drive_client) so that importing the
+# package does not pull in the Google API client and transcription stack.
@@ -1,21 +1,23 @@
 """
 Download manager for orchestrating file downloads from Google Drive and Photos.
-Handles parallel scanning, sequential downloading, pause/resume, and state persistence.
+Handles parallel scanning, parallel downloading, pause/resume, and state persistence.
 """
 
+import os
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Callable, List, Dict
 
 from .google_auth import get_auth_manager
-from .drive_client import get_drive_client, VIDEO_MIME_TYPES, GOOGLE_DOCS_EXPORT
+from .drive_client import get_drive_client, VIDEO_MIME_SET
 from .photos_client import get_photos_client
-from utils.config import get_config_manager, FileState, DownloadStats
-from utils.paths import Paths
-from utils.logger import get_logger
-from utils.notifications import (
+from ..utils.config import get_config_manager, FileState, DownloadStats
+from ..utils.paths import Paths
+from ..utils.logger import get_logger
+from ..utils.notifications import (
     notify_download_started,
     notify_download_complete,
     notify_download_error
@@ -23,16 +25,32 @@ from utils.notifications import (
 
 logger = get_logger()
 
+# Download state is flushed to disk after this many finished files or this
+# many seconds, whichever comes first, instead of after every file
+STATE_FLUSH_FILES = 50
+STATE_FLUSH_INTERVAL = 5.0
+
 
 class DownloadManager:
     """Manages downloading files from Google Drive and Photos."""
 
     def __init__(self):
         self._is_downloading = False
-        self._is_paused = False
-        self._should_stop = False
+        # Set while running; cleared to pause. Workers block on it instead of
+        # polling, and stop_download sets it so paused workers wake up.
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._stop_event = threading.Event()
+        # Guards the "anything left to download?" check against a scan adding
+        # files and asking for a download at the same moment
+        self._batch_lock = threading.Lock()
+        # Drive changes token from the current scan, saved once its files are
+        self._next_drive_changes: Optional[Dict] = None
         self._current_file: Optional[str] = None
         self._download_thread: Optional[threading.Thread] = None
+        # Download pool, kept across batches so threads aren't respawned
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers = 0
 
         # Callbacks
         self._on_progress: Optional[Callable[[str, int, int], None]] = None
@@ -48,7 +66,7 @@ class DownloadManager:
     @property
     def is_paused(self) -> bool:
         """Check if downloads are paused."""
-        return self._is_paused
+        return not self._resume_event.is_set()
 
     @property
     def current_file(self) -> Optional[str]:
@@ -73,13 +91,16 @@ class DownloadManager:
 
     def scan_sources(
         self,
-        progress_callback: Optional[Callable[[str, int], None]] = None
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        download_as_ready: bool = False
     ) -> DownloadStats:
         """
         Scan Google Drive and Photos for files to download.
 
         Args:
             progress_callback: Optional callback(source_name, file_count)
+            download_as_ready: Start downloading each source's files as soon
+                as its scan finishes, rather than after both scans
 
         Returns:
             Statistics about found files
@@ -91,11 +112,11 @@ class DownloadManager:
         config_manager = get_config_manager()
         config = config_manager.get_config()
 
-        drive_files: List[FileState] = []
-        photos_files: List[FileState] = []
         errors: List[str] = []
+        download_started = False
 
-        # Scan Drive and Photos in parallel
+        # Scan Drive and Photos in parallel; each source is stored as soon as
+        # its scan finishes so downloads can overlap the slower scan
         with ThreadPoolExecutor(max_workers=2) as executor:
             futures = {}
 
@@ -116,58 +137,95 @@ class DownloadManager:
                 source = futures[future]
                 try:
                     files = future.result()
-                    if source == "drive":
-                        drive_files = files
-                        if progress_callback:
-                            progress_callback("Google Drive", len(files))
-                    else:
-                        photos_files = files
-                        if progress_callback:
-                            progress_callback("Google Photos", len(files))
                 except Exception as e:
                     logger.error(f"Error scanning {source}: {e}")
                     errors.append(f"{source}: {e}")
+                    continue
 
-        # Update state with found files
-        drive_state = config_manager.get_drive_state()
-        photos_state = config_manager.get_photos_state()
+                if progress_callback:
+                    progress_callback(
+                        "Google Drive" if source == "drive" else "Google Photos",
+                        len(files)
+                    )
+                self._store_scanned_files(source, files)
 
-        # Add new files (preserve existing state for already-known files)
-        for file in drive_files:
-            if file.id not in drive_state:
-                drive_state[file.id] = file
-            else:
-                # Update metadata but preserve status
-                existing = drive_state[file.id]
-                file.status = existing.status
-                file.downloaded_at = existing.downloaded_at
-                file.local_path = existing.local_path
-                drive_state[file.id] = file
-
-        for file in photos_files:
-            if file.id not in photos_state:
-                photos_state[file.id] = file
-            else:
-                existing = photos_state[file.id]
-                file.status = existing.status
-                file.downloaded_at = existing.downloaded_at
-                file.local_path = existing.local_path
-                photos_state[file.id] = file
+                if download_as_ready and files:
+                    download_started |= self._start_download_if_idle()
 
-        # Save state
-        config_manager.save_drive_state()
-        config_manager.save_photos_state()
+        if download_as_ready and not download_started:
+            self._start_download_if_idle()
 
         # Return stats
         return config_manager.get_download_stats()
 
+    def _store_scanned_files(self, source: str, files: List[FileState]) -> None:
+        """Store scanned files, preserving the status of already-known ones."""
+        config_manager = get_config_manager()
+
+        if source == "drive":
+            known = config_manager.get_drive_state()
+        else:
+            known = config_manager.get_photos_state()
+
+        # Update metadata but preserve status (one lookup per file)
+        for file in files:
+            existing = known.get(file.id)
+            if existing is not None:
+                file.status, file.downloaded_at, file.local_path = (
+                    existing.status, existing.downloaded_at, existing.local_path
+                )
+
+        # Store and save state
+        if source == "drive":
+            config_manager.update_drive_files(files)
+            # Only advance the changes token once the files it covers are saved
+            if self._next_drive_changes is not None:
+                config_manager.save_drive_changes_token(self._next_drive_changes)
+                self._next_drive_changes = None
+        else:
+            config_manager.update_photos_files(files)
+
     def _scan_drive(self, include_videos: bool, include_documents: bool) -> List[FileState]:
-        """Scan Google Drive for files."""
+        """
+        Scan Google Drive for files.
+
+        After a full listing, later scans only fetch what changed since the
+        saved changes token. A full listing is done again if there's no token,
+        no saved Drive state, or the file types to include have changed.
+        """
         drive_client = get_drive_client()
-        return drive_client.list_all_videos_and_documents(
+        config_manager = get_config_manager()
+        saved = config_manager.get_drive_changes_token()
+
+        if (saved
+                and config_manager.get_drive_state()
+                and saved.get("include_videos") == include_videos
+                and saved.get("include_documents") == include_documents):
+            try:
+                files, token = drive_client.list_changed_videos_and_documents(
+                    saved["token"],
+                    include_videos=include_videos,
+                    include_documents=include_documents
+                )
+                self._next_drive_changes = dict(saved, token=token)
+                return files
+            except Exception as e:
+                # Tokens can expire; fall back to a full listing
+                logger.warning(f"Drive changes scan failed, doing a full scan: {e}")
+
+        # Take the token before listing so nothing changed during the listing
+        # is missed next time
+        token = drive_client.get_start_page_token()
+        files = drive_client.list_all_videos_and_documents(
             include_videos=include_videos,
             include_documents=include_documents
         )
+        self._next_drive_changes = {
+            "token": token,
+            "include_videos": include_videos,
+            "include_documents": include_documents,
+        }
+        return files
 
     def _scan_photos(self) -> List[FileState]:
         """Scan Google Photos for videos."""
@@ -176,32 +234,46 @@ class DownloadManager:
 
     def start_download(self) -> None:
         """Start downloading pending files in background thread."""
-        if self._is_downloading:
+        if not self._start_download_if_idle():
             logger.warning("Download already in progress")
-            return
 
-        self._is_downloading = True
-        self._is_paused = False
-        self._should_stop = False
+    def _start_download_if_idle(self) -> bool:
+        """
+        Start the download worker unless one is already running.
 
-        self._download_thread = threading.Thread(
-            target=self._download_worker,
-            daemon=True
-        )
-        self._download_thread.start()
+        A running worker re-checks for pending files before it exits, so
+        anything stored before this call is picked up either way.
+
+        Returns:
+            True if a new worker was started
+        """
+        with self._batch_lock:
+            if self._is_downloading:
+                return False
+
+            self._is_downloading = True
+            self._resume_event.set()
+            self._stop_event.clear()
+
+            self._download_thread = threading.Thread(
+                target=self._download_worker,
+                daemon=True
+            )
+            self._download_thread.start()
+        return True
 
     def pause_download(self) -> None:
         """Pause the current download."""
         if not self._is_downloading:
             return
-        self._is_paused = True
+        self._resume_event.clear()
         logger.info("Download paused")
 
     def resume_download(self) -> None:
         """Resume a paused download."""
         if not self._is_downloading:
             return
-        self._is_paused = False
+        self._resume_event.set()
         logger.info("Download resumed")
 
     def stop_download(self) -> None:
@@ -209,8 +281,8 @@ class DownloadManager:
         if not self._is_downloading:
             return
 
-        self._should_stop = True
-        self._is_paused = False
+        self._stop_event.set()
+        self._resume_event.set()
 
         # Stop the clients
         get_drive_client().stop()
@@ -220,126 +292,303 @@ class DownloadManager:
         if self._download_thread and self._download_thread.is_alive():
             self._download_thread.join(timeout=5.0)
 
-        self._is_downloading = False
+        # The worker clears _is_downloading itself once it has really exited,
+        # so a download started meanwhile can't run alongside it
         logger.info("Download stopped")
 
     def reset(self) -> None:
         """Reset state for new operations."""
         self._is_downloading = False
-        self._is_paused = False
-        self._should_stop = False
+        self._resume_event.set()
+        self._stop_event.clear()
         self._current_file = None
         get_drive_client().reset()
         get_photos_client().reset()
 
+    def shutdown(self) -> None:
+        """Release the download thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_workers = 0
+
+    def _get_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        """Get the download pool, recreating it if the worker count changed."""
+        if self._executor is None or self._executor_workers != max_workers:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="gmb-download"
+            )
+            self._executor_workers = max_workers
+        return self._executor
+
     def _download_worker(self) -> None:
         """Worker thread for downloading files."""
         config_manager = get_config_manager()
         config = config_manager.get_config()
         download_path = Path(config.download_path)
 
-        # Get all pending files
-        drive_state = config_manager.get_drive_state()
-        photos_state = config_manager.get_photos_state()
-
-        pending_files: List[tuple] = []  # (file_state, source_type)
-
-        for file_id, file_state in drive_state.items():
-            if file_state.status == "pending":
-                pending_files.append((file_state, "drive"))
-
-        for file_id, file_state in photos_state.items():
-            if file_state.status == "pending":
-                pending_files.append((file_state, "photos"))
-
-        if not pending_files:
-            logger.info("No pending files to download")
-            self._is_downloading = False
-            if self._on_download_complete:
-                self._on_download_complete(config_manager.get_download_stats())
-            return
+        # Resolve (and create) the destination directories once per batch
+        # instead of once per file
+        dest_dirs = {
+            "drive_videos": Paths.get_drive_videos_dir(download_path),
+            "photos_videos": Paths.get_photos_videos_dir(download_path),
+            "documents": Paths.get_documents_dir(download_path),
+        }
 
-        notify_download_started(len(pending_files))
         downloaded_count = 0
         skipped_count = 0
         error_count = 0
+        attempted: set = set()  # (source, id) pairs already handled this batch
+        claimed_names: Dict[Path, set] = {}  # destination names taken this run
+        dirty_sources: set = set()  # sources with unsaved state changes
+        unsaved_count = 0
+        last_flush = time.monotonic()
+
+        # Downloads are I/O-bound and independent, so run several at once.
+        # Results are handled here on the worker thread, so the counters and
+        # state updates below don't need locking.
+        max_workers = max(1, config.max_concurrent_downloads)
+        went_idle = False
+        try:
+            # Keep draining until nothing new is pending, so files stored by a
+            # scan that is still running get picked up by this batch
+            while True:
+                pending_files = []
+                if not self._stop_event.is_set():
+                    pending_files = self._get_unattempted_pending(attempted)
+
+                if not pending_files:
+                    # Final flush; anything lost to a crash between flushes is
+                    # already on disk and gets skipped on the next run
+                    self._flush_state(dirty_sources)
+
+                    # Only go idle after the flush, and only if no scan stored
+                    # new files meanwhile; until then a scan asking for a
+                    # download sees this worker running and leaves them to it
+                    with self._batch_lock:
+                        if self._stop_event.is_set() or not self._get_unattempted_pending(attempted):
+                            self._current_file = None
+                            self._is_downloading = False
+                            went_idle = True
+                            break
+                    continue
+
+                if not attempted:
+                    notify_download_started(len(pending_files))
+                attempted.update((fs.source, fs.id) for fs, _ in pending_files)
+
+                # Sizes of files already on disk, so the skip check doesn't
+                # need a stat() per candidate file
+                existing_sizes = {
+                    dest_dir: self._scan_existing_files(dest_dir)
+                    for dest_dir in set(dest_dirs.values())
+                }
+
+                executor = self._get_executor(max_workers)
+                futures = {}
+                for file_state, source_type in pending_files:
+                    # Claim the destination before submitting, so files with
+                    # the same name never download into the same path at once
+                    dest_dir = self._get_dest_dir(file_state, source_type, dest_dirs)
+                    dest_name = self._claim_dest_name(file_state.name, dest_dir, claimed_names)
+                    future = executor.submit(
+                        self._download_pending_file,
+                        file_state, source_type, dest_dir, dest_name, existing_sizes[dest_dir]
+                    )
+                    futures[future] = (file_state, source_type, dest_dir)
+
+                for future in as_completed(futures):
+                    if self._stop_event.is_set():
+                        # Drop downloads that haven't started yet
+                        for pending in futures:
+                            pending.cancel()
+
+                    if future.cancelled():
+                        continue
+
+                    file_state, source_type, dest_dir = futures[future]
+                    result = future.result()
+                    if result is None:
+                        continue  # Stopped before this file started
+
+                    success, was_skipped = result
+
+                    if success:
+                        if was_skipped:
+                            skipped_count += 1
+                        else:
+                            downloaded_count += 1
+                        file_state.status = "complete"
+                        file_state.downloaded_at = datetime.now().isoformat()
+
+                        if self._on_file_complete:
+                            self._on_file_complete(file_state)
+                    else:
+                        error_count += 1
+                        # An interrupted Photos download keeps its .part file;
+                        # leave the file pending so the next run resumes it
+                        if (source_type == "photos"
+                                and get_photos_client().has_partial_download(dest_dir, file_state.id)):
+                            file_state.status = "pending"
+                        else:
+                            file_state.status = "error"
+
+                    # Update state; saves are coalesced
+                    if source_type == "drive":
+                        config_manager.update_drive_file(file_state, save=False)
+                    else:
+                        config_manager.update_photos_file(file_state, save=False)
+                    dirty_sources.add(source_type)
+                    unsaved_count += 1
+
+                    now = time.monotonic()
+                    if unsaved_count >= STATE_FLUSH_FILES or now - last_flush >= STATE_FLUSH_INTERVAL:
+                        self._flush_state(dirty_sources)
+                        unsaved_count = 0
+                        last_flush = now
+        finally:
+            if not went_idle:
+                # Failed unexpectedly; save what finished and don't leave the
+                # manager stuck as busy
+                self._flush_state(dirty_sources)
+                with self._batch_lock:
+                    self._current_file = None
+                    self._is_downloading = False
 
-        for file_state, source_type in pending_files:
-            # Check for stop/pause
-            if self._should_stop:
-                break
+        stats = config_manager.get_download_stats()
+        if not attempted:
+            logger.info("No pending files to download")
+        else:
+            notify_download_complete(downloaded_count, skipped_count, error_count)
 
-            while self._is_paused:
-                if self._should_stop:
-                    break
-                threading.Event().wait(0.5)
+        if self._on_download_complete:
+            self._on_download_complete(stats)
+
+    def _get_unattempted_pending(self, attempted: set) -> List[tuple]:
+        """
+        Get pending files the current worker hasn't handled yet.
 
-            if self._should_stop:
-                break
+        Returns:
+            List of (file_state, source_type) tuples
+        """
+        return [
+            (file_state, file_state.source)
+            for file_state in get_config_manager().get_files_with_status("pending")
+            if (file_state.source, file_state.id) not in attempted
+        ]
+
+    def _flush_state(self, dirty_sources: set) -> None:
+        """Save the state of sources with unsaved changes and clear the set."""
+        config_manager = get_config_manager()
+        if "drive" in dirty_sources:
+            config_manager.save_drive_state()
+        if "photos" in dirty_sources:
+            config_manager.save_photos_state()
+        dirty_sources.clear()
 
-            # Download the file
-            self._current_file = file_state.name
-            success, was_skipped = self._download_single_file(file_state, source_type, download_path)
+    def _download_pending_file(
+        self,
+        file_state: FileState,
+        source_type: str,
+        dest_dir: Path,
+        dest_name: str,
+        existing_sizes: Dict[str, int]
+    ) -> Optional[tuple]:
+        """
+        Wait while paused, then download a single file.
 
-            if success:
-                if was_skipped:
-                    skipped_count += 1
-                else:
-                    downloaded_count += 1
-                file_state.status = "complete"
-                file_state.downloaded_at = datetime.now().isoformat()
-
-                if self._on_file_complete:
-                    self._on_file_complete(file_state)
-            else:
-                error_count += 1
-                file_state.status = "error"
+        Returns:
+            Result of _download_single_file, or None if stopped before starting
+        """
+        self._resume_event.wait()
 
-            # Update state
-            if source_type == "drive":
-                config_manager.update_drive_file(file_state)
-            else:
-                config_manager.update_photos_file(file_state)
+        if self._stop_event.is_set():
+            return None
 
-        self._current_file = None
-        self._is_downloading = False
+        self._current_file = file_state.name
+        return self._download_single_file(
+            file_state, source_type, dest_dir, dest_name, existing_sizes
+        )
 
-        stats = config_manager.get_download_stats()
-        notify_download_complete(downloaded_count, skipped_count, error_count)
+    def _claim_dest_name(
+        self,
+        name: str,
+        dest_dir: Path,
+        claimed_names: Dict[Path, set]
+    ) -> str:
+        """
+        Pick a file name in dest_dir that no other file uses this run.
 
-        if self._on_download_complete:
-            self._on_download_complete(stats)
+        Drive allows several files with the same name in one folder (e.g.
+        "Untitled document"); later ones get " (1)", " (2)", ... appended.
+        Only called from the download worker thread, so no lock is needed.
+        """
+        claimed = claimed_names.setdefault(dest_dir, set())
+        stem, suffix = os.path.splitext(name)
+        candidate = name
+        counter = 1
+        # Windows file names are case-insensitive
+        while os.path.normcase(candidate) in claimed:
+            candidate = f"{stem} ({counter}){suffix}"
+            counter += 1
+        claimed.add(os.path.normcase(candidate))
+        return candidate
+
+    def _scan_existing_files(self, dest_dir: Path) -> Dict[str, int]:
+        """Map file names in a directory to their sizes with one scandir pass."""
+        existing: Dict[str, int] = {}
+        try:
+            with os.scandir(dest_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        existing[entry.name] = entry.stat().st_size
+        except OSError as e:
+            logger.warning(f"Could not scan {dest_dir}: {e}")
+        return existing
+
+    def _get_dest_dir(
+        self,
+        file_state: FileState,
+        source_type: str,
+        dest_dirs: Dict[str, Path]
+    ) -> Path:
+        """Pick the destination directory for a file."""
+        mime_type = file_state.mime_type
+        # Known types hit the set; the prefix check catches other video types
+        is_video = mime_type in VIDEO_MIME_SET or mime_type.startswith("video/")
+
+        if not is_video:
+            return dest_dirs["documents"]
+        if source_type == "drive":
+            return dest_dirs["drive_videos"]
+        return dest_dirs["photos_videos"]
 
     def _download_single_file(
         self,
         file_state: FileState,
         source_type: str,
-        download_path: Path
+        dest_dir: Path,
+        dest_name: str,
+        existing_sizes: Dict[str, int]
     ) -> tuple:
         """
-        Download a single file.
+        Download a single file into an existing destination directory.
+
+        Args:
+            dest_name: File name to save as, claimed by _claim_dest_name
 
         Returns:
             Tuple of (success: bool, was_skipped: bool)
         """
         try:
-            # Determine destination directory
-            if file_state.mime_type.startswith("video/") or file_state.mime_type in GOOGLE_DOCS_EXPORT:
-                if source_type == "drive":
-                    if file_state.mime_type.startswith("video/"):
-                        dest_dir = Paths.get_drive_videos_dir(download_path)
-                    else:
-                        dest_dir = Paths.get_documents_dir(download_path)
-                else:
-                    dest_dir = Paths.get_photos_videos_dir(download_path)
-            else:
-                dest_dir = Paths.get_documents_dir(download_path)
-
             # Create destination path
-            destination = dest_dir / file_state.name
+            destination = dest_dir / dest_name
 
-            # Check if file already exists (skip)
-            if destination.exists():
+            # Check if a non-empty file already exists (skip)
+            if existing_sizes.get(dest_name, 0) > 0:
                 logger.debug(f"File already exists: {destination}")
                 file_state.local_path = str(destination)
                 return True, True  # Success, was skipped
@@ -391,33 +640,11 @@ class DownloadManager:
 
     def get_pending_files(self) -> List[FileState]:
         """Get list of pending files."""
-        config_manager = get_config_manager()
-        pending = []
-
-        for file_state in config_manager.get_drive_state().values():
-            if file_state.status == "pending":
-                pending.append(file_state)
-
-        for file_state in config_manager.get_photos_state().values():
-            if file_state.status == "pending":
-                pending.append(file_state)
-
-        return pending
+        return get_config_manager().get_files_with_status("pending")
 
     def get_completed_files(self) -> List[FileState]:
         """Get list of completed files."""
-        config_manager = get_config_manager()
-        completed = []
-
-        for file_state in config_manager.get_drive_state().values():
-            if file_state.status == "complete":
-                completed.append(file_state)
-
-        for file_state in config_manager.get_photos_state().values():
-            if file_state.status == "complete":
-                completed.append(file_state)
-
-        return completed
+        return get_config_manager().get_files_with_status("complete")
 
 
 # Singleton instance
@@ -3,18 +3,16 @@ Google Drive API client for listing and downloading files.
 Supports videos and documents with Google Docs export functionality.
 """
 
-import io
-import os
+import threading
 from pathlib import Path
 from typing import List, Optional, Callable, Dict, Any
 
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+import requests
 from googleapiclient.errors import HttpError
 
 from .google_auth import get_auth_manager
-from utils.logger import get_logger
-from utils.config import FileState
+from ..utils.logger import get_logger
+from ..utils.config import FileState
 
 logger = get_logger()
 
@@ -32,6 +30,9 @@ VIDEO_MIME_TYPES = [
     "video/x-flv",
 ]
 
+# Set form for membership tests on the per-file download path
+VIDEO_MIME_SET = frozenset(VIDEO_MIME_TYPES)
+
 # Document MIME types to download
 DOCUMENT_MIME_TYPES = [
     "application/pdf",
@@ -59,18 +60,36 @@ GOOGLE_DOCS_EXPORT = {
     ),
 }
 
+# files.list page size (the API maximum) and the most sub-requests the
+# batch endpoint accepts in one call
+LIST_PAGE_SIZE = 1000
+LIST_BATCH_SIZE = 100
+
+# Drive files endpoint used for media downloads and exports
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+
+# Bytes read from a download response per write
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# (connect, read) timeout in seconds for download requests
+DOWNLOAD_TIMEOUT = (10, 120)
+
 
 class DriveClient:
     """Client for interacting with Google Drive API."""
 
     def __init__(self):
-        self._service = None
+        # googleapiclient's http object isn't thread-safe, so each thread
+        # gets its own service; bumping the generation invalidates them all
+        self._local = threading.local()
+        self._service_generation = 0
         self._should_stop = False
 
     def _get_service(self):
-        """Get or create the Drive API service."""
-        if self._service is not None:
-            return self._service
+        """Get or create the Drive API service for the calling thread."""
+        service = getattr(self._local, "service", None)
+        if service is not None and self._local.generation == self._service_generation:
+            return service
 
         auth_manager = get_auth_manager()
         credentials = auth_manager.credentials
@@ -78,12 +97,16 @@ class DriveClient:
         if credentials is None:
             raise RuntimeError("Not authenticated with Google")
 
-        self._service = build("drive", "v3", credentials=credentials)
-        return self._service
+        # Imported on first use; the discovery module is slow to load
+        from googleapiclient.discovery import build
+
+        self._local.service = build("drive", "v3", credentials=credentials)
+        self._local.generation = self._service_generation
+        return self._local.service
 
     def invalidate_service(self) -> None:
-        """Invalidate the cached service (call after re-auth)."""
-        self._service = None
+        """Invalidate the cached services (call after re-auth)."""
+        self._service_generation += 1
 
     def list_all_videos_and_documents(
         self,
@@ -94,6 +117,10 @@ class DriveClient:
         """
         List all videos and documents from Google Drive.
 
+        Each MIME type is listed as a separate query. The current page of
+        every query is sent together in one batch HTTP request, so a round
+        costs one round trip no matter how many MIME types are included.
+
         Args:
             include_videos: Include video files
             include_documents: Include document files
@@ -102,63 +129,53 @@ class DriveClient:
         Returns:
             List of FileState objects for each file
         """
-        service = self._get_service()
         files: List[FileState] = []
 
-        # Build MIME type query
-        mime_queries = []
+        mime_types = self._get_mime_types(include_videos, include_documents)
+        if not mime_types:
+            return files
 
-        if include_videos:
-            for mime in VIDEO_MIME_TYPES:
-                mime_queries.append(f"mimeType='{mime}'")
+        service = self._get_service()
+        seen_ids = set()
 
-        if include_documents:
-            for mime in DOCUMENT_MIME_TYPES:
-                mime_queries.append(f"mimeType='{mime}'")
-            # Include Google Workspace docs for export
-            for mime in GOOGLE_DOCS_EXPORT.keys():
-                mime_queries.append(f"mimeType='{mime}'")
+        # MIME type -> token of the next page to fetch (None for the first)
+        pending: Dict[str, Optional[str]] = {mime: None for mime in mime_types}
+        errors: List[Exception] = []
 
-        if not mime_queries:
-            return files
+        def collect(mime_type: str, response: Dict[str, Any], exception: Optional[Exception]) -> None:
+            if exception is not None:
+                errors.append(exception)
+                return
+
+            items = response.get("files", [])
+            for item in items:
+                if item["id"] in seen_ids:
+                    continue
+                seen_ids.add(item["id"])
+                files.append(self._to_file_state(item))
 
-        query = f"({' or '.join(mime_queries)}) and trashed=false"
+            logger.debug(f"Listed {len(items)} {mime_type} files")
 
-        page_token = None
-        page_count = 0
+            page_token = response.get("nextPageToken")
+            if page_token:
+                pending[mime_type] = page_token
 
         try:
-            while True:
-                # Request files with pagination
-                results = service.files().list(
-                    q=query,
-                    pageSize=100,
-                    pageToken=page_token,
-                    fields="nextPageToken, files(id, name, mimeType, size, createdTime, modifiedTime)"
-                ).execute()
-
-                items = results.get("files", [])
-                page_count += 1
-
-                for item in items:
-                    file_state = FileState(
-                        id=item["id"],
-                        name=item["name"],
-                        source="drive",
-                        mime_type=item.get("mimeType", ""),
-                        size=int(item.get("size", 0)),
-                        status="pending"
-                    )
-                    files.append(file_state)
+            while pending:
+                current = list(pending.items())
+                pending.clear()
 
-                if progress_callback:
-                    progress_callback(len(files), len(files))
+                for start in range(0, len(current), LIST_BATCH_SIZE):
+                    batch = service.new_batch_http_request(callback=collect)
+                    for mime_type, page_token in current[start:start + LIST_BATCH_SIZE]:
+                        batch.add(self._list_request(service, mime_type, page_token), request_id=mime_type)
+                    batch.execute()
 
-                logger.debug(f"Listed {len(items)} files from page {page_count}")
+                if errors:
+                    raise errors[0]
 
-                page_token = results.get("nextPageToken")
-                if not page_token:
-                    break
+                if progress_callback:
+                    progress_callback(len(files), len(files))
 
             logger.info(f"Found {len(files)} files in Google Drive")
             return files
@@ -167,6 +184,100 @@ class DriveClient:
             logger.error(f"Error listing Drive files: {e}")
             raise
 
+    def get_start_page_token(self) -> str:
+        """Get the changes token for the current state of the Drive."""
+        service = self._get_service()
+        return service.changes().getStartPageToken().execute()["startPageToken"]
+
+    def list_changed_videos_and_documents(
+        self,
+        page_token: str,
+        include_videos: bool = True,
+        include_documents: bool = True
+    ) -> tuple:
+        """
+        List files added or modified since a changes token was taken.
+
+        Removed and trashed files are skipped, matching a full listing
+        (which never drops files from the saved state either).
+
+        Args:
+            page_token: Token from get_start_page_token or a previous call
+            include_videos: Include video files
+            include_documents: Include document files
+
+        Returns:
+            Tuple of (changed FileStates, token for the next call)
+        """
+        service = self._get_service()
+        mime_types = set(self._get_mime_types(include_videos, include_documents))
+        files: Dict[str, FileState] = {}
+
+        while True:
+            results = service.changes().list(
+                pageToken=page_token,
+                pageSize=LIST_PAGE_SIZE,
+                # Same scope as the full listing (corpora="user"): My Drive
+                # plus files shared with the user, but not shared drives
+                spaces="drive",
+                fields="nextPageToken, newStartPageToken, "
+                       "changes(fileId, removed, file(id, name, mimeType, size, parents, trashed))"
+            ).execute()
+
+            for change in results.get("changes", []):
+                item = change.get("file")
+                if change.get("removed") or not item or item.get("trashed"):
+                    continue
+                if item.get("mimeType") in mime_types:
+                    files[item["id"]] = self._to_file_state(item)
+
+            if "newStartPageToken" in results:
+                new_token = results["newStartPageToken"]
+                break
+            page_token = results["nextPageToken"]
+
+        logger.info(f"Found {len(files)} changed files in Google Drive")
+        return list(files.values()), new_token
+
+    def _get_mime_types(self, include_videos: bool, include_documents: bool) -> List[str]:
+        """Collect the MIME types to list."""
+        mime_types: List[str] = []
+
+        if include_videos:
+            mime_types.extend(VIDEO_MIME_TYPES)
+
+        if include_documents:
+            mime_types.extend(DOCUMENT_MIME_TYPES)
+            # Include Google Workspace docs for export
+            mime_types.extend(GOOGLE_DOCS_EXPORT.keys())
+
+        return mime_types
+
+    def _to_file_state(self, item: Dict[str, Any]) -> FileState:
+        """Build a pending FileState from a Drive file resource."""
+        return FileState(
+            id=item["id"],
+            name=item["name"],
+            source="drive",
+            mime_type=item.get("mimeType", ""),
+            size=int(item.get("size", 0)),
+            status="pending",
+            parent_id=(item.get("parents") or [None])[0]
+        )
+
+    def _list_request(self, service, mime_type: str, page_token: Optional[str]):
+        """Build a files.list request for one page of a single MIME type."""
+        return service.files().list(
+            q=f"mimeType='{mime_type}' and trashed=false",
+            pageSize=LIST_PAGE_SIZE,
+            pageToken=page_token,
+            # Only the fields FileState uses; the user's own and shared-with-
+            # me files, with no shared-drive traversal
+            fields="nextPageToken, files(id, name, mimeType, size, parents)",
+            spaces="drive",
+            corpora="user"
+        )
+
     def download_file(
         self,
         file_id: str,
@@ -179,64 +290,24 @@ class DriveClient:
 
         Args:
             file_id: The Drive file ID
-            destination: Local path to save the file
+            destination: Local path to save the file (its directory must exist)
             mime_type: MIME type of the file (for determining export)
             progress_callback: Optional callback(bytes_downloaded, total_bytes)
 
         Returns:
             True if download was successful
         """
-        service = self._get_service()
-
-        try:
-            # Check if this is a Google Workspace file that needs export
-            if mime_type in GOOGLE_DOCS_EXPORT:
-                return self._export_file(file_id, destination, mime_type, progress_callback)
-
-            # Regular file download
-            request = service.files().get_media(fileId=file_id)
-
-            # Ensure parent directory exists
-            destination.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(destination, "wb") as f:
-                downloader = MediaIoBaseDownload(f, request)
-                done = False
-
-                while not done:
-                    status, done = downloader.next_chunk()
-
-                    if status and progress_callback:
-                        progress = int(status.progress() * 100)
-                        progress_callback(progress, 100)
-
-            # Validate file was downloaded properly (not empty)
-            if destination.exists() and destination.stat().st_size == 0:
-                logger.warning(f"Downloaded file is empty, removing: {destination}")
-                destination.unlink()
-                return False
-
-            logger.debug(f"Downloaded file to {destination}")
-            return True
-
-        except HttpError as e:
-            logger.error(f"Error downloading file {file_id}: {e}")
-            # Clean up partial file
-            if destination.exists():
-                try:
-                    destination.unlink()
-                except Exception:
-                    pass
-            return False
-        except Exception as e:
-            logger.error(f"Unexpected error downloading file: {e}")
-            # Clean up partial file
-            if destination.exists():
-                try:
-                    destination.unlink()
-                except Exception:
-                    pass
-            return False
+        # Check if this is a Google Workspace file that needs export
+        if mime_type in GOOGLE_DOCS_EXPORT:
+            return self._export_file(file_id, destination, mime_type, progress_callback)
+
+        # Regular file download
+        return self._stream_to_file(
+            f"{DRIVE_FILES_URL}/{file_id}",
+            {"alt": "media"},
+            destination,
+            progress_callback
+        )
 
     def _export_file(
         self,
@@ -250,15 +321,13 @@ class DriveClient:
 
         Args:
             file_id: The Drive file ID
-            destination: Local path to save the file
+            destination: Local path to save the file (its directory must exist)
             source_mime_type: Original Google Workspace MIME type
             progress_callback: Optional callback(bytes_downloaded, total_bytes)
 
         Returns:
             True if export was successful
         """
-        service = self._get_service()
-
         if source_mime_type not in GOOGLE_DOCS_EXPORT:
             logger.warning(f"Unknown export type: {source_mime_type}")
             return False
@@ -269,37 +338,69 @@ class DriveClient:
         if not str(destination).lower().endswith(extension.lower()):
             destination = destination.with_suffix(extension)
 
-        try:
-            request = service.files().export_media(
-                fileId=file_id,
-                mimeType=export_mime
-            )
-
-            # Ensure parent directory exists
-            destination.parent.mkdir(parents=True, exist_ok=True)
+        return self._stream_to_file(
+            f"{DRIVE_FILES_URL}/{file_id}/export",
+            {"mimeType": export_mime},
+            destination,
+            progress_callback
+        )
 
-            with open(destination, "wb") as f:
-                downloader = MediaIoBaseDownload(f, request)
-                done = False
+    def _stream_to_file(
+        self,
+        url: str,
+        params: Dict[str, str],
+        destination: Path,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> bool:
+        """
+        Stream a Drive media or export response into a file.
 
-                while not done:
-                    status, done = downloader.next_chunk()
+        Uses the shared pooled session rather than MediaIoBaseDownload, so
+        each file is a single keep-alive GET instead of a series of range
+        requests on a per-thread connection.
 
-                    if status and progress_callback:
-                        progress = int(status.progress() * 100)
-                        progress_callback(progress, 100)
+        Returns:
+            True if the file was written and isn't empty
+        """
+        session = get_auth_manager().get_authorized_session()
+        if session is None:
+            raise RuntimeError("Not authenticated with Google")
 
-            # Validate file was exported properly (not empty)
-            if destination.exists() and destination.stat().st_size == 0:
-                logger.warning(f"Exported file is empty, removing: {destination}")
+        try:
+            with session.get(url, params=params, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+
+                total_size = int(response.headers.get("content-length", 0))
+                downloaded = 0
+                last_progress = -1
+
+                # Chunks are large, so write them straight to the file
+                # rather than copying through Python's write buffer
+                with open(destination, "wb", buffering=0) as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        downloaded += len(chunk)
+
+                        # Only report whole-percent changes, so the UI gets at
+                        # most ~100 updates per file
+                        if progress_callback and total_size > 0:
+                            progress = downloaded * 100 // total_size
+                            if progress != last_progress:
+                                last_progress = progress
+                                progress_callback(progress, 100)
+
+            # Validate file was downloaded properly (not empty); it was
+            # just written, so a single stat() is enough
+            if destination.stat().st_size == 0:
+                logger.warning(f"Downloaded file is empty, removing: {destination}")
                 destination.unlink()
                 return False
 
-            logger.debug(f"Exported file to {destination}")
+            logger.debug(f"Downloaded file to {destination}")
             return True
 
-        except HttpError as e:
-            logger.error(f"Error exporting file {file_id}: {e}")
+        except requests.RequestException as e:
+            logger.error(f"Error downloading {url}: {e}")
             # Clean up partial file
             if destination.exists():
                 try:
@@ -308,7 +409,7 @@ class DriveClient:
                     pass
             return False
         except Exception as e:
-            logger.error(f"Unexpected error exporting file: {e}")
+            logger.error(f"Unexpected error downloading file: {e}")
             # Clean up partial file
             if destination.exists():
                 try:
@@ -347,13 +448,17 @@ class DriveClient:
         self._should_stop = False
 
 
-# Singleton instance
+# Singleton instance; created under a lock since worker threads can ask
+# for it at the same time as the UI thread
 _drive_client: Optional[DriveClient] = None
+_drive_client_lock = threading.Lock()
 
 
 def get_drive_client() -> DriveClient:
     """Get the global DriveClient instance."""
     global _drive_client
     if _drive_client is None:
-        _drive_client = DriveClient()
+        with _drive_client_lock:
+            if _drive_client is None:
+                _drive_client = DriveClient()
     return _drive_client
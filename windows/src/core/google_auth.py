@@ -5,17 +5,29 @@ Handles OAuth flow, token storage, and refresh for Google Drive and Photos APIs.
 
 import os
 import json
+import threading
+from contextlib import contextmanager
+import time
 import webbrowser
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional, Callable
+from datetime import datetime, timezone
+from typing import Optional, Callable, TYPE_CHECKING
 
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-from utils.paths import Paths
-from utils.logger import get_logger
+# The Google auth libraries are imported where they're first needed, so
+# starting the app (and never signing in) doesn't pay for loading them
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google.auth.transport.requests import AuthorizedSession
+
+from ..utils.paths import Paths
+from ..utils.logger import get_logger
+from ..utils.file_lock import file_lock
 
 logger = get_logger()
 
@@ -26,42 +38,143 @@ SCOPES = [
     "https://www.googleapis.com/auth/photoslibrary.readonly"
 ]
 
+# The token is refreshed in the background once this fraction of its
+# remaining lifetime has passed, so requests never wait on a refresh
+REFRESH_AT_FRACTION = 0.8
+
+# Seconds before expiry at which an inline refresh is still forced, and the
+# shortest/retry delay for the background refresh
+TOKEN_EXPIRY_BUFFER = 300
+REFRESH_RETRY_DELAY = 60
+
+# Keep-alive connections per host in the shared media download session;
+# comfortably above max_concurrent_downloads
+SESSION_POOL_SIZE = 16
+
+# Transient statuses retried (with backoff) by the media download session
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Seconds to wait for another process holding the token file lock; token
+# reads happen on the UI thread, so a hung holder mustn't freeze it
+TOKEN_LOCK_TIMEOUT = 5.0
+
+
+@contextmanager
+def _token_file_lock():
+    """
+    Hold an OS-level lock on the token file for the duration of the block.
+
+    Keeps two app processes from interleaving token reads, refreshes and
+    writes. If the lock can't be taken within TOKEN_LOCK_TIMEOUT the block
+    still runs, unlocked.
+
+    Yields:
+        True if the lock is held
+    """
+    with file_lock(Paths.get_token_file().with_suffix(".lock"), timeout=TOKEN_LOCK_TIMEOUT) as locked:
+        yield locked
+
 
 class GoogleAuthManager:
     """Manages Google OAuth 2.0 authentication."""
 
     def __init__(self):
-        self._credentials: Optional[Credentials] = None
+        self._credentials: Optional["Credentials"] = None
+        self._session: Optional["AuthorizedSession"] = None
         self._on_auth_change: Optional[Callable[[bool], None]] = None
 
+        # Guards credential loads/refreshes between the UI, download threads
+        # and the background refresh timer
+        self._lock = threading.RLock()
+        self._refresh_timer: Optional[threading.Timer] = None
+        # Bumped on every successful refresh, so threads that queued up
+        # behind one refresh can tell it already happened
+        self._refresh_count = 0
+        # time.monotonic() until which the token is known to be good (with
+        # TOKEN_EXPIRY_BUFFER to spare); lets hot paths skip the checks
+        self._valid_until = 0.0
+        # Token expiry as an epoch, and the expiry datetime it was taken from
+        self._expiry_epoch = 0.0
+        self._expiry_source: Optional[datetime] = None
+        # Hash of the token file contents last read or written
+        self._saved_token_hash: Optional[int] = None
+
     @property
     def is_authenticated(self) -> bool:
         """Check if user is currently authenticated with valid credentials."""
-        if self._credentials is None:
-            self._credentials = self._load_credentials()
+        if time.monotonic() < self._valid_until:
+            return True
 
-        if self._credentials is None:
-            return False
+        with self._lock:
+            if self._credentials is None:
+                self._credentials = self._load_credentials()
+                if self._credentials is not None:
+                    self._schedule_refresh()
 
-        # Check if credentials are valid and not expired
-        if self._credentials.expired and self._credentials.refresh_token:
-            try:
-                self._credentials.refresh(Request())
-                self._save_credentials()
-                return True
-            except Exception as e:
-                logger.warning(f"Failed to refresh credentials: {e}")
+            if self._credentials is None:
                 return False
 
-        return self._credentials.valid
+            # Check if credentials are valid and not expired
+            if self._credentials.expired and self._credentials.refresh_token:
+                try:
+                    self._refresh_credentials()
+                    self._schedule_refresh()
+                    return True
+                except Exception as e:
+                    logger.warning(f"Failed to refresh credentials: {e}")
+                    return False
+
+            return self._credentials.valid
 
     @property
-    def credentials(self) -> Optional[Credentials]:
+    def credentials(self) -> Optional["Credentials"]:
         """Get the current credentials, refreshing if needed."""
         if not self.is_authenticated:
             return None
         return self._credentials
 
+    def get_authorized_session(self) -> Optional["AuthorizedSession"]:
+        """
+        Get the shared HTTP session for media downloads.
+
+        The session adds (and refreshes) the auth header itself and keeps
+        connections alive, so parallel downloads reuse TLS connections
+        instead of handshaking for every file.
+        """
+        # Fast path only while the session still wraps the current
+        # credentials; a re-sign-in or refresh from disk replaces them
+        session = self._session
+        if (session is not None
+                and session.credentials is self._credentials
+                and time.monotonic() < self._valid_until):
+            return session
+
+        credentials = self.credentials
+        if credentials is None:
+            return None
+
+        if self._session is None or self._session.credentials is not credentials:
+            from google.auth.transport.requests import AuthorizedSession
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = AuthorizedSession(credentials)
+            adapter = HTTPAdapter(
+                pool_connections=SESSION_POOL_SIZE,
+                pool_maxsize=SESSION_POOL_SIZE,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset(["GET"])
+                )
+            )
+            # A replaced session isn't closed; downloads still using it
+            # finish on it and it's released with them
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
     def set_auth_change_callback(self, callback: Callable[[bool], None]) -> None:
         """Set callback for auth state changes."""
         self._on_auth_change = callback
@@ -114,6 +227,8 @@ class GoogleAuthManager:
             return False
 
         try:
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
             # Create OAuth flow
             flow = InstalledAppFlow.from_client_secrets_file(
                 str(credentials_file),
@@ -131,6 +246,7 @@ class GoogleAuthManager:
 
             # Save credentials
             self._save_credentials()
+            self._schedule_refresh()
 
             logger.info("Successfully authenticated with Google")
             if self._on_auth_change:
@@ -149,13 +265,20 @@ class GoogleAuthManager:
 
     def sign_out(self) -> None:
         """Sign out and clear stored credentials."""
-        self._credentials = None
+        with self._lock:
+            self._cancel_refresh()
+            self._valid_until = 0.0
+            self._credentials = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
         # Delete token file
         token_file = Paths.get_token_file()
         if token_file.exists():
             try:
                 token_file.unlink()
+                self._saved_token_hash = None
                 logger.info("Signed out and removed token file")
             except Exception as e:
                 logger.warning(f"Failed to delete token file: {e}")
@@ -165,51 +288,132 @@ class GoogleAuthManager:
 
     def refresh_token(self) -> bool:
         """Manually refresh the access token."""
-        if self._credentials is None:
-            return False
+        seen_count = self._refresh_count
+        with self._lock:
+            if self._credentials is None:
+                return False
 
-        if not self._credentials.refresh_token:
-            logger.warning("No refresh token available")
-            return False
+            # Another thread refreshed while this one waited for the lock
+            if self._refresh_count != seen_count and self._credentials.valid:
+                return True
 
-        try:
-            self._credentials.refresh(Request())
-            self._save_credentials()
-            logger.info("Token refreshed successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to refresh token: {e}")
-            return False
+            if not self._credentials.refresh_token:
+                logger.warning("No refresh token available")
+                return False
+
+            try:
+                self._refresh_credentials()
+                logger.info("Token refreshed successfully")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to refresh token: {e}")
+                return False
+            finally:
+                # Reschedule either way; a failed refresh retries shortly
+                self._schedule_refresh()
 
     def get_access_token(self) -> Optional[str]:
-        """Get the current access token, refreshing if needed."""
-        if not self.is_authenticated:
-            return None
+        """
+        Get the current access token.
 
-        # Refresh if expiring soon (within 60 seconds)
-        if self._credentials.expired or self._is_expiring_soon():
-            if not self.refresh_token():
+        The background timer normally keeps the token fresh, so this only
+        refreshes inline if the timer hasn't run in time.
+        """
+        credentials = self._credentials
+        if credentials is not None and time.monotonic() < self._valid_until:
+            return credentials.token
+
+        with self._lock:
+            if not self.is_authenticated:
                 return None
 
-        return self._credentials.token
+            if self._credentials.expired or self._is_expiring_soon(TOKEN_EXPIRY_BUFFER):
+                if not self.refresh_token():
+                    return None
+
+            return self._credentials.token
+
+    def _schedule_refresh(self) -> None:
+        """(Re)start the background timer that refreshes the token early."""
+        with self._lock:
+            self._cancel_refresh()
+            self._valid_until = 0.0
+
+            credentials = self._credentials
+            if credentials is None or not credentials.refresh_token:
+                return
+
+            delay = float(REFRESH_RETRY_DELAY)
+            if credentials.expiry and not credentials.expired:
+                # google-auth keeps expiry as naive UTC
+                remaining = (credentials.expiry - datetime.utcnow()).total_seconds()
+                delay = max(delay, remaining * REFRESH_AT_FRACTION)
+                self._valid_until = time.monotonic() + remaining - TOKEN_EXPIRY_BUFFER
+
+            self._refresh_timer = threading.Timer(delay, self.refresh_token)
+            self._refresh_timer.daemon = True
+            self._refresh_timer.start()
+            logger.debug(f"Token refresh scheduled in {delay:.0f}s")
+
+    def _cancel_refresh(self) -> None:
+        """Cancel the background refresh timer, if any."""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
 
     def _is_expiring_soon(self, buffer_seconds: int = 60) -> bool:
         """Check if token is expiring within the buffer period."""
         if not self._credentials or not self._credentials.expiry:
             return True
 
+        # Convert the expiry to an epoch once per expiry value (it changes on
+        # every refresh, including ones done by the authorized session)
         expiry_time = self._credentials.expiry
-        # Handle timezone-naive datetime
-        if expiry_time.tzinfo is None:
-            buffer_time = datetime.utcnow() + timedelta(seconds=buffer_seconds)
-        else:
-            from datetime import timezone
-            buffer_time = datetime.now(timezone.utc) + timedelta(seconds=buffer_seconds)
+        if expiry_time is not self._expiry_source:
+            # Handle timezone-naive datetime (google-auth uses naive UTC)
+            if expiry_time.tzinfo is None:
+                expiry_time = expiry_time.replace(tzinfo=timezone.utc)
+            self._expiry_epoch = expiry_time.timestamp()
+            self._expiry_source = self._credentials.expiry
 
-        return expiry_time <= buffer_time
+        return self._expiry_epoch - time.time() <= buffer_seconds
 
-    def _load_credentials(self) -> Optional[Credentials]:
+    def _refresh_credentials(self) -> None:
+        """
+        Refresh the access token and save it, under the token file lock.
+
+        If another process has already written a fresh token, that token
+        is used instead of refreshing again. Raises if the refresh fails.
+        """
+        from google.auth.transport.requests import Request
+
+        with _token_file_lock():
+            previous_hash = self._saved_token_hash
+            on_disk = self._read_credentials()
+            if (on_disk is not None
+                    and self._saved_token_hash != previous_hash
+                    and on_disk.refresh_token
+                    and on_disk.valid):
+                self._credentials = on_disk
+                self._refresh_count += 1
+                logger.info("Using token refreshed by another process")
+                return
+
+            self._credentials.refresh(Request())
+            self._refresh_count += 1
+            self._write_credentials()
+
+    def _load_credentials(self) -> Optional["Credentials"]:
         """Load credentials from the token file."""
+        with _token_file_lock() as locked:
+            if not locked and self._credentials is not None:
+                # Lock timed out; keep the credentials already in memory
+                return self._credentials
+            # Token writes are atomic replaces, so an unlocked read is safe
+            return self._read_credentials()
+
+    def _read_credentials(self) -> Optional["Credentials"]:
+        """Read credentials from the token file (caller holds the file lock)."""
         token_file = Paths.get_token_file()
 
         if not token_file.exists():
@@ -217,9 +421,12 @@ class GoogleAuthManager:
             return None
 
         try:
-            with open(token_file, "r", encoding="utf-8") as f:
-                token_data = json.load(f)
+            with open(token_file, "rb") as f:
+                raw = f.read()
+            self._saved_token_hash = hash(raw)
+            token_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
+            from google.oauth2.credentials import Credentials
             credentials = Credentials(
                 token=token_data.get("token"),
                 refresh_token=token_data.get("refresh_token"),
@@ -231,8 +438,10 @@ class GoogleAuthManager:
 
             # Set expiry if available
             if "expiry" in token_data:
-                from dateutil.parser import parse
-                credentials._expiry = parse(token_data["expiry"]).replace(tzinfo=None)
+                # Written by _save_credentials with isoformat(), so the stdlib
+                # parser is enough
+                expiry = token_data["expiry"].replace("Z", "+00:00")
+                credentials._expiry = datetime.fromisoformat(expiry).replace(tzinfo=None)
 
             logger.debug("Loaded credentials from token file")
             return credentials
@@ -243,6 +452,11 @@ class GoogleAuthManager:
 
     def _save_credentials(self) -> None:
         """Save credentials to the token file."""
+        with _token_file_lock():
+            self._write_credentials()
+
+    def _write_credentials(self) -> None:
+        """Write credentials to the token file (caller holds the file lock)."""
         if self._credentials is None:
             return
 
@@ -261,8 +475,25 @@ class GoogleAuthManager:
             if self._credentials.expiry:
                 token_data["expiry"] = self._credentials.expiry.isoformat()
 
-            with open(token_file, "w", encoding="utf-8") as f:
-                json.dump(token_data, f, indent=2)
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(token_data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(token_data, indent=2).encode("utf-8")
+
+            # Nothing changed since the last load/save
+            payload_hash = hash(payload)
+            if payload_hash == self._saved_token_hash:
+                return
+
+            # Write a temp file and swap it in, so a crash mid-write can't
+            # leave a corrupt token file behind
+            tmp_file = token_file.with_suffix(".json.tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, token_file)
+            self._saved_token_hash = payload_hash
 
             logger.debug("Saved credentials to token file")
 
@@ -270,13 +501,17 @@ class GoogleAuthManager:
             logger.error(f"Failed to save credentials: {e}")
 
 
-# Singleton instance
+# Singleton instance; created under a lock since worker threads can ask
+# for it at the same time as the UI thread
 _auth_manager: Optional[GoogleAuthManager] = None
+_auth_manager_lock = threading.Lock()
 
 
 def get_auth_manager() -> GoogleAuthManager:
     """Get the global GoogleAuthManager instance."""
     global _auth_manager
     if _auth_manager is None:
-        _auth_manager = GoogleAuthManager()
+        with _auth_manager_lock:
+            if _auth_manager is None:
+                _auth_manager = GoogleAuthManager()
     return _auth_manager
@@ -3,54 +3,176 @@ Google Photos API client for listing and downloading videos.
 Uses the Photos Library API to access media items.
 """
 
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 import requests
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
 from pathlib import Path
 from typing import List, Optional, Callable, Dict, Any
 
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-
 from .google_auth import get_auth_manager
-from utils.logger import get_logger
-from utils.config import FileState
+from ..utils.logger import get_logger
+from ..utils.config import FileState
 
 logger = get_logger()
 
 
+# Photos Library API base URL
+PHOTOS_API_URL = "https://photoslibrary.googleapis.com/v1"
+
+# (connect, read) timeout in seconds for API calls
+API_TIMEOUT = (10, 60)
+
+# (connect, read) timeout in seconds for video downloads; the read timeout
+# is per socket read, so long downloads aren't cut off
+DOWNLOAD_TIMEOUT = (10, 120)
+
 # Video media types in Google Photos
 VIDEO_MEDIA_TYPE = "VIDEO"
 
+# mediaItems.search page size (the API maximum)
+SEARCH_PAGE_SIZE = 100
+
+# Base URLs expire after about 60 minutes; treat them as stale a bit earlier
+BASE_URL_TTL = 50 * 60
+
+# Most IDs mediaItems.batchGet accepts in one call
+BATCH_GET_SIZE = 50
+
+# Bytes copied per read when downloading, and bytes between progress reports
+COPY_BLOCK_SIZE = 1024 * 1024
+PROGRESS_BYTES = 4 * 1024 * 1024
+
+# Blocks the network reader may get ahead of the disk writer
+PIPELINE_DEPTH = 8
+
+# Suffix of in-progress downloads, kept on network errors so they can resume
+PART_SUFFIX = ".part"
+
+
+def _part_path(dest_dir: Path, media_item_id: str) -> Path:
+    """
+    Path of the in-progress download of a media item.
+
+    Named after the media ID rather than the file name, which can differ
+    between runs when several items share a name.
+    """
+    return dest_dir / f"{media_item_id}{PART_SUFFIX}"
+
+
+class _ProgressWriter:
+    """File wrapper that reports download progress every PROGRESS_BYTES."""
+
+    def __init__(
+        self,
+        f,
+        total_size: int,
+        progress_callback: Optional[Callable[[int, int], None]],
+        start: int = 0
+    ):
+        self._f = f
+        self._total_size = total_size
+        self._progress_callback = progress_callback if total_size > 0 else None
+        self._written = start
+        # Report every PROGRESS_BYTES and once on reaching the end
+        self._next_report = min(start + PROGRESS_BYTES, total_size)
+        self._last_progress = -1
+
+    def write(self, data: bytes) -> int:
+        written = self._f.write(data)
+        self._written += len(data)
+
+        if self._progress_callback and self._written >= self._next_report:
+            if self._written >= self._total_size:
+                self._next_report = float("inf")
+            else:
+                self._next_report = min(self._written + PROGRESS_BYTES, self._total_size)
+            # Skip reports that wouldn't change the displayed percentage
+            progress = min(100, self._written * 100 // self._total_size)
+            if progress != self._last_progress:
+                self._last_progress = progress
+                self._progress_callback(progress, 100)
+
+        return written
+
+
+def _copy_pipelined(source, dest) -> None:
+    """
+    Copy a stream to a file with reads and writes on separate threads.
+
+    The calling thread reads COPY_BLOCK_SIZE blocks from the network while a
+    writer thread flushes them to disk, so a slow disk doesn't stall the
+    socket (and vice versa). Errors on either side are raised here.
+    """
+    blocks: queue.Queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+    errors: List[BaseException] = []
+
+    def write_blocks() -> None:
+        try:
+            while True:
+                block = blocks.get()
+                if block is None:
+                    return
+                dest.write(block)
+        except BaseException as e:
+            errors.append(e)
+            # Keep draining so the reader never blocks on a full queue
+            while blocks.get() is not None:
+                pass
+
+    writer = threading.Thread(target=write_blocks, name="gmb-photos-writer", daemon=True)
+    writer.start()
+    try:
+        while not errors:
+            block = source.read(COPY_BLOCK_SIZE)
+            if not block:
+                break
+            blocks.put(block)
+    finally:
+        blocks.put(None)
+        writer.join()
+
+    if errors:
+        raise errors[0]
+
 
 class PhotosClient:
     """Client for interacting with Google Photos Library API."""
 
     def __init__(self):
-        self._service = None
         self._should_stop = False
 
-    def _get_service(self):
-        """Get or create the Photos API service."""
-        if self._service is not None:
-            return self._service
+        # Media item ID -> (baseUrl, monotonic time fetched), filled while
+        # listing so downloads don't need a mediaItems.get each
+        self._base_urls: Dict[str, tuple] = {}
+        self._base_urls_lock = threading.Lock()
 
-        auth_manager = get_auth_manager()
-        credentials = auth_manager.credentials
+    def _api_request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        """
+        Call a Photos Library API endpoint and return the JSON response.
 
-        if credentials is None:
+        Goes straight through the shared authorized session rather than a
+        discovery-built service: only a few endpoints are used, and this
+        skips fetching the discovery document and the per-thread clients.
+        The session adds auth, refreshes on 401 and is thread-safe.
+        """
+        session = get_auth_manager().get_authorized_session()
+        if session is None:
             raise RuntimeError("Not authenticated with Google")
 
-        # Build the Photos Library API service
-        self._service = build(
-            "photoslibrary",
-            "v1",
-            credentials=credentials,
-            static_discovery=False
+        response = session.request(
+            method,
+            f"{PHOTOS_API_URL}/{path}",
+            timeout=API_TIMEOUT,
+            **kwargs
         )
-        return self._service
-
-    def invalidate_service(self) -> None:
-        """Invalidate the cached service (call after re-auth)."""
-        self._service = None
+        response.raise_for_status()
+        return response.json()
 
     def list_all_videos(
         self,
@@ -59,70 +181,74 @@ class PhotosClient:
         """
         List all videos from Google Photos.
 
+        Pages are chained by nextPageToken, so they can't be fetched in
+        parallel; instead the next page is requested in the background as
+        soon as its token is known, while the current page is processed.
+
         Args:
             progress_callback: Optional callback(current_count, total_estimated)
 
         Returns:
             List of FileState objects for each video
         """
-        service = self._get_service()
         videos: List[FileState] = []
-
-        page_token = None
         page_count = 0
 
         try:
-            while True:
-                # Build request body with video filter
-                request_body = {
-                    "pageSize": 100,
-                    "filters": {
-                        "mediaTypeFilter": {
-                            "mediaTypes": [VIDEO_MEDIA_TYPE]
-                        }
-                    }
-                }
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="gmb-photos-list") as executor:
+                future = executor.submit(self._search_videos_page, None)
 
-                if page_token:
-                    request_body["pageToken"] = page_token
+                while future is not None:
+                    results = future.result()
 
-                # Search for videos
-                results = service.mediaItems().search(body=request_body).execute()
+                    # Prefetch the next page before processing this one
+                    page_token = results.get("nextPageToken")
+                    future = executor.submit(self._search_videos_page, page_token) if page_token else None
 
-                items = results.get("mediaItems", [])
-                page_count += 1
+                    items = results.get("mediaItems", [])
+                    page_count += 1
+                    self._cache_base_urls(items)
 
-                for item in items:
-                    # Extract video metadata
-                    metadata = item.get("mediaMetadata", {})
-                    video_meta = metadata.get("video", {})
+                    for item in items:
+                        file_state = FileState(
+                            id=item["id"],
+                            name=item.get("filename", f"video_{item['id'][:8]}"),
+                            source="photos",
+                            mime_type=item.get("mimeType", "video/mp4"),
+                            size=0,  # Photos API doesn't provide file size
+                            status="pending"
+                        )
+                        videos.append(file_state)
 
-                    file_state = FileState(
-                        id=item["id"],
-                        name=item.get("filename", f"video_{item['id'][:8]}"),
-                        source="photos",
-                        mime_type=item.get("mimeType", "video/mp4"),
-                        size=0,  # Photos API doesn't provide file size
-                        status="pending"
-                    )
-                    videos.append(file_state)
+                    if progress_callback:
+                        progress_callback(len(videos), len(videos))
 
-                if progress_callback:
-                    progress_callback(len(videos), len(videos))
-
-                logger.debug(f"Listed {len(items)} videos from page {page_count}")
-
-                page_token = results.get("nextPageToken")
-                if not page_token:
-                    break
+                    logger.debug(f"Listed {len(items)} videos from page {page_count}")
 
             logger.info(f"Found {len(videos)} videos in Google Photos")
             return videos
 
-        except HttpError as e:
+        except requests.RequestException as e:
             logger.error(f"Error listing Photos videos: {e}")
             raise
 
+    def _search_videos_page(self, page_token: Optional[str]) -> Dict[str, Any]:
+        """Fetch one page of video search results."""
+        # Build request body with video filter
+        request_body = {
+            "pageSize": SEARCH_PAGE_SIZE,
+            "filters": {
+                "mediaTypeFilter": {
+                    "mediaTypes": [VIDEO_MEDIA_TYPE]
+                }
+            }
+        }
+
+        if page_token:
+            request_body["pageToken"] = page_token
+
+        return self._api_request("POST", "mediaItems:search", json=request_body)
+
     def download_video(
         self,
         media_item_id: str,
@@ -132,22 +258,21 @@ class PhotosClient:
         """
         Download a video from Google Photos.
 
+        The video is written to "<media ID>.part" and renamed when complete.
+        A .part left by a network error is resumed with a Range request.
+
         Args:
             media_item_id: The Photos media item ID
-            destination: Local path to save the file
+            destination: Local path to save the file (its directory must exist)
             progress_callback: Optional callback(bytes_downloaded, total_bytes)
 
         Returns:
             True if download was successful
         """
-        service = self._get_service()
         auth_manager = get_auth_manager()
 
         try:
-            # Get the media item to get the base URL
-            item = service.mediaItems().get(mediaItemId=media_item_id).execute()
-
-            base_url = item.get("baseUrl")
+            base_url = self._get_base_url(media_item_id)
             if not base_url:
                 logger.error(f"No base URL for media item {media_item_id}")
                 return False
@@ -155,69 +280,82 @@ class PhotosClient:
             # For videos, append =dv to get the downloadable video
             download_url = f"{base_url}=dv"
 
-            # Get access token for the request
-            access_token = auth_manager.get_access_token()
-            if not access_token:
+            # Shared pooled session, so downloads reuse keep-alive connections
+            session = auth_manager.get_authorized_session()
+            if session is None:
                 logger.error("No access token available")
                 return False
 
-            headers = {
-                "Authorization": f"Bearer {access_token}"
-            }
-
-            # Ensure parent directory exists
-            destination.parent.mkdir(parents=True, exist_ok=True)
-
-            # Download the video with streaming
-            response = requests.get(download_url, headers=headers, stream=True)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get("content-length", 0))
-            downloaded = 0
-
-            with open(destination, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
+            # Download into a .part file, resuming a previous partial
+            # download with a Range request if there is one
+            part_path = _part_path(destination.parent, media_item_id)
+            try:
+                resume_from = part_path.stat().st_size
+            except FileNotFoundError:
+                resume_from = 0
+
+            headers = {}
+            if resume_from:
+                headers["Range"] = f"bytes={resume_from}-"
+                headers["Accept-Encoding"] = "identity"
+
+            with session.get(
+                download_url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT
+            ) as response:
+                if response.status_code == 416:
+                    # Range no longer valid for this file; start over next time
+                    part_path.unlink()
+                    logger.warning(f"Could not resume {destination.name}, partial file discarded")
+                    return False
+                response.raise_for_status()
+
+                content_length = int(response.headers.get("content-length", 0))
+                if response.status_code == 206:
+                    logger.debug(f"Resuming {destination.name} from byte {resume_from}")
+                    mode = "ab"
+                else:
+                    # Server ignored the range; start from scratch
+                    resume_from = 0
+                    mode = "wb"
+                total_size = resume_from + content_length if content_length else 0
+
+                # Copy the raw stream in large blocks, writing to disk on a
+                # separate thread; the writer reports progress every
+                # PROGRESS_BYTES rather than per block
+                response.raw.decode_content = True
+                with open(part_path, mode) as f:
+                    writer = _ProgressWriter(f, total_size, progress_callback, resume_from)
+                    _copy_pipelined(response.raw, writer)
+
+            # Validate file was downloaded properly (not empty); it was
+            # just written, so a single stat() is enough
+            if part_path.stat().st_size == 0:
+                logger.warning(f"Downloaded video is empty, removing: {part_path}")
+                part_path.unlink()
+                return False
 
-                        if progress_callback and total_size > 0:
-                            progress = int((downloaded / total_size) * 100)
-                            progress_callback(progress, 100)
+            os.replace(part_path, destination)
 
-            # Validate file was downloaded properly (not empty)
-            if destination.exists() and destination.stat().st_size == 0:
-                logger.warning(f"Downloaded video is empty, removing: {destination}")
-                destination.unlink()
-                return False
+            # Done with this item; don't refresh its URL again
+            with self._base_urls_lock:
+                self._base_urls.pop(media_item_id, None)
 
             logger.debug(f"Downloaded video to {destination}")
             return True
 
-        except HttpError as e:
-            logger.error(f"Error downloading video {media_item_id}: {e}")
-            # Clean up partial file
-            if destination.exists():
-                try:
-                    destination.unlink()
-                except Exception:
-                    pass
-            return False
-        except requests.RequestException as e:
-            logger.error(f"HTTP error downloading video: {e}")
-            # Clean up partial file
-            if destination.exists():
-                try:
-                    destination.unlink()
-                except Exception:
-                    pass
+        except (requests.RequestException, Urllib3HTTPError, OSError) as e:
+            # Network drops while reading the raw stream surface as urllib3
+            # or socket errors; keep the .part file so the next attempt
+            # resumes from it
+            logger.error(f"Network error downloading video: {e}")
             return False
         except Exception as e:
             logger.error(f"Unexpected error downloading video: {e}")
             # Clean up partial file
-            if destination.exists():
+            part_path = _part_path(destination.parent, media_item_id)
+            if part_path.exists():
                 try:
-                    destination.unlink()
+                    part_path.unlink()
                 except Exception:
                     pass
             return False
@@ -232,14 +370,58 @@ class PhotosClient:
         Returns:
             Media item dict or None if not found
         """
-        service = self._get_service()
-
         try:
-            return service.mediaItems().get(mediaItemId=media_item_id).execute()
-        except HttpError as e:
+            return self._api_request("GET", f"mediaItems/{media_item_id}")
+        except requests.RequestException as e:
             logger.error(f"Error getting media item info: {e}")
             return None
 
+    def _cache_base_urls(self, items: List[Dict[str, Any]]) -> None:
+        """Remember the base URLs of media items."""
+        now = time.monotonic()
+        with self._base_urls_lock:
+            for item in items:
+                base_url = item.get("baseUrl")
+                if base_url:
+                    self._base_urls[item["id"]] = (base_url, now)
+
+    def _get_base_url(self, media_item_id: str) -> Optional[str]:
+        """
+        Get a fresh base URL for a media item.
+
+        Cached URLs are used while fresh. Otherwise the item is fetched with
+        mediaItems.batchGet together with other stale cached items, so
+        later downloads find fresh URLs in the cache.
+        """
+        now = time.monotonic()
+        with self._base_urls_lock:
+            cached = self._base_urls.get(media_item_id)
+            if cached and now - cached[1] < BASE_URL_TTL:
+                return cached[0]
+
+            others = (
+                item_id for item_id, (_, fetched) in self._base_urls.items()
+                if item_id != media_item_id and now - fetched >= BASE_URL_TTL
+            )
+            ids = [media_item_id] + list(islice(others, BATCH_GET_SIZE - 1))
+
+        results = self._api_request("GET", "mediaItems:batchGet", params={"mediaItemIds": ids})
+        self._cache_base_urls([
+            result["mediaItem"]
+            for result in results.get("mediaItemResults", [])
+            if "mediaItem" in result
+        ])
+
+        with self._base_urls_lock:
+            cached = self._base_urls.get(media_item_id)
+        if cached and cached[1] >= now:
+            return cached[0]
+        return None
+
+    def has_partial_download(self, dest_dir: Path, media_item_id: str) -> bool:
+        """Check whether an interrupted download left a .part file to resume."""
+        return _part_path(dest_dir, media_item_id).exists()
+
     def stop(self) -> None:
         """Signal to stop ongoing operations."""
         self._should_stop = True
@@ -249,13 +431,17 @@ class PhotosClient:
         self._should_stop = False
 
 
-# Singleton instance
+# Singleton instance; created under a lock since worker threads can ask
+# for it at the same time as the UI thread
 _photos_client: Optional[PhotosClient] = None
+_photos_client_lock = threading.Lock()
 
 
 def get_photos_client() -> PhotosClient:
     """Get the global PhotosClient instance."""
     global _photos_client
     if _photos_client is None:
-        _photos_client = PhotosClient()
+        with _photos_client_lock:
+            if _photos_client is None:
+                _photos_client = PhotosClient()
     return _photos_client
@@ -3,18 +3,25 @@ Transcription manager for video files using faster-whisper.
 Handles audio extraction, model management, and transcript generation.
 """
 
+import functools
+import gc
+import importlib.util
 import os
+import queue
 import subprocess
 import shutil
 import threading
+import time
+from contextlib import ExitStack
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Callable, List
+from typing import Any, Optional, Callable, Dict, List, Set, Tuple
 
-from utils.config import get_config_manager, TranscriptionState
-from utils.paths import Paths
-from utils.logger import get_logger
-from utils.notifications import (
+from ..utils.config import get_config_manager, TranscriptionState
+from ..utils.paths import Paths
+from ..utils.logger import get_logger
+from ..utils.file_lock import file_lock
+from ..utils.notifications import (
     notify_transcription_started,
     notify_transcription_file_complete,
     notify_transcription_batch_complete,
@@ -33,6 +40,44 @@ WHISPER_MODELS = {
     "large": "large-v3",
 }
 
+# Converter shipped with ctranslate2; needs transformers and torch installed
+CT2_CONVERTER = "ct2-transformers-converter"
+
+# ffmpeg decodes audio to mono at Whisper's sample rate
+SAMPLE_RATE = 16000
+
+# Clips shorter than this, or quieter than this mean amplitude, get an
+# empty transcript without running the model
+MIN_SPEECH_SECONDS = 1.5
+SILENCE_LEVEL = 1e-4
+
+# Minimum seconds between progress callbacks (segments can arrive faster
+# than the UI should redraw) and between saves of in-progress FileStates
+PROGRESS_INTERVAL = 0.1
+STATUS_SAVE_INTERVAL = 2.0
+
+# Cached GPU memory is only released between files when the free fraction
+# drops below this; otherwise the allocator's pools are reused
+GPU_FREE_THRESHOLD = 0.1
+
+# Videos whose audio is extracted ahead of the transcriber. Decoded audio
+# is float32 at 16 kHz, about 64 KB per second (230 MB per hour). At peak,
+# three tracks are in memory: the one being transcribed, one queued, and
+# one the extractor holds while waiting for the queue to free up.
+EXTRACT_QUEUE_SIZE = 1
+
+# Transcripts are written under this suffix and renamed when complete
+PART_SUFFIX = ".part"
+
+# Seconds a pre-warmed model may sit unused before it is unloaded again
+PREWARM_IDLE_UNLOAD = 600.0
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_path() -> Optional[str]:
+    """Locate ffmpeg on PATH once; cleared by TranscriptionManager.reset()."""
+    return shutil.which("ffmpeg")
+
 
 class TranscriptionManager:
     """Manages video transcription using faster-whisper."""
@@ -40,7 +85,7 @@ class TranscriptionManager:
     @staticmethod
     def is_ffmpeg_available() -> bool:
         """Check if ffmpeg is installed and available."""
-        return shutil.which("ffmpeg") is not None
+        return _ffmpeg_path() is not None
 
     @staticmethod
     def is_transcription_ready() -> tuple:
@@ -50,7 +95,7 @@ class TranscriptionManager:
         Returns:
             Tuple of (is_ready: bool, status_message: str)
         """
-        if not shutil.which("ffmpeg"):
+        if not _ffmpeg_path():
             return False, "FFmpeg not installed"
 
         try:
@@ -61,7 +106,29 @@ class TranscriptionManager:
 
     def __init__(self):
         self._model = None
-        self._model_name: Optional[str] = None
+        self._pipeline = None
+        self._model_key: Optional[Tuple[str, str, int]] = None
+        self._device = "cpu"
+        self._model_lock = threading.Lock()
+        # Serializes loading/unloading so a background pre-warm and the
+        # batch worker share one load
+        self._loading_lock = threading.Lock()
+        self._conversion_thread: Optional[threading.Thread] = None
+        # Quantized copies whose conversion failed this session; not retried
+        self._failed_conversions: Set[Path] = set()
+        self._pending_count_cache: Optional[Tuple[int, int]] = None
+        self._last_status_save = 0.0
+        self._logged_gpu_release = False
+
+        # Normalized file names per directory, so checking a video for an
+        # existing transcript is one scandir per folder rather than three
+        # stats per video. Cleared at the start of each batch.
+        self._dir_entries: Dict[str, Set[str]] = {}
+        self._dir_entries_lock = threading.Lock()
+
+        # Language detected per Drive folder ID, reused for "auto" so only
+        # the first video in a folder pays for language identification
+        self._folder_languages: Dict[str, str] = {}
         self._is_transcribing = False
         self._should_stop = False
         self._current_file: Optional[str] = None
@@ -94,38 +161,93 @@ class TranscriptionManager:
         """Set callback for transcription errors."""
         self._on_error = callback
 
-    def _load_model(self, model_name: str = "small") -> bool:
-        """Load the Whisper model."""
-        if self._model is not None and self._model_name == model_name:
+    @staticmethod
+    def _select_device(compute_type: str = "auto") -> Tuple[str, str]:
+        """
+        Pick the device and CTranslate2 compute type for the model.
+
+        Args:
+            compute_type: Requested compute type, or "auto" to choose one
+
+        Returns:
+            Tuple of (device, compute_type)
+        """
+        # Use CPU by default, CUDA if available
+        device = "cpu"
+        auto_type = "int8"
+
+        try:
+            import torch
+            if torch.cuda.is_available():
+                device = "cuda"
+                # Turing and newer have INT8 tensor cores
+                if torch.cuda.get_device_capability() >= (7, 5):
+                    auto_type = "int8_float16"
+                else:
+                    auto_type = "float16"
+                logger.info("Using CUDA for transcription")
+        except ImportError:
+            pass
+
+        if compute_type == "auto":
+            return device, auto_type
+        return device, compute_type
+
+    def _load_model(
+        self,
+        model_name: str = "small",
+        compute_type: str = "auto",
+        cpu_threads: int = -1
+    ) -> bool:
+        """Load the Whisper model, reloading if the model, compute type or thread count changed."""
+        with self._loading_lock:
+            return self._load_model_locked(model_name, compute_type, cpu_threads)
+
+    def _load_model_locked(self, model_name: str, compute_type: str, cpu_threads: int) -> bool:
+        """Load the Whisper model (caller holds the loading lock)."""
+        model_key = (model_name, compute_type, cpu_threads)
+        if self._model is not None and self._model_key == model_key:
             return True
 
         try:
             from faster_whisper import WhisperModel
 
             cache_dir = Paths.get_cache_dir()
+            device, resolved_type = self._select_device(compute_type)
+
+            logger.info(f"Loading Whisper model: {model_name} ({device}, {resolved_type})")
+
+            model_options: Dict[str, Any] = {"device": device, "compute_type": resolved_type}
+            if device == "cpu":
+                # Leave a couple of cores for the UI and for ffmpeg extracting
+                # the next video. One worker is enough: transcribe calls are
+                # serialized by _model_lock.
+                if cpu_threads <= 0:
+                    cpu_threads = max(1, (os.cpu_count() or 4) - 2)
+                model_options["cpu_threads"] = cpu_threads
+
+            quantized_dir = self._ensure_quantized_model(model_name, resolved_type)
+            if quantized_dir is not None:
+                self._model = WhisperModel(
+                    str(quantized_dir),
+                    local_files_only=True,
+                    **model_options
+                )
+            else:
+                self._model = WhisperModel(
+                    WHISPER_MODELS.get(model_name, model_name),
+                    download_root=str(cache_dir),
+                    **model_options
+                )
+            self._model_key = model_key
+            self._device = device
 
-            logger.info(f"Loading Whisper model: {model_name}")
-
-            # Use CPU by default, CUDA if available
-            device = "cpu"
-            compute_type = "int8"
-
+            # Batched decoding of VAD chunks (faster-whisper >= 1.1)
             try:
-                import torch
-                if torch.cuda.is_available():
-                    device = "cuda"
-                    compute_type = "float16"
-                    logger.info("Using CUDA for transcription")
+                from faster_whisper import BatchedInferencePipeline
+                self._pipeline = BatchedInferencePipeline(model=self._model)
             except ImportError:
-                pass
-
-            self._model = WhisperModel(
-                WHISPER_MODELS.get(model_name, model_name),
-                device=device,
-                compute_type=compute_type,
-                download_root=str(cache_dir)
-            )
-            self._model_name = model_name
+                self._pipeline = None
 
             logger.info(f"Loaded Whisper model: {model_name}")
             return True
@@ -137,50 +259,167 @@ class TranscriptionManager:
             logger.error(f"Failed to load Whisper model: {e}")
             return False
 
-    def _extract_audio(self, video_path: Path, audio_path: Path) -> bool:
-        """Extract audio from video using ffmpeg."""
-        if not shutil.which("ffmpeg"):
+    def _ensure_quantized_model(self, model_name: str, compute_type: str) -> Optional[Path]:
+        """
+        Get the pre-quantized CTranslate2 copy of a model, if one exists.
+
+        Loading weights already stored in the target precision skips the
+        conversion faster-whisper otherwise does on every start. If the copy
+        is missing and transcription_quantize_models is on, it is built in
+        the background for the next load. Building it downloads the full
+        Hugging Face checkpoint and needs transformers installed.
+
+        Returns:
+            Path to the quantized model directory, or None if not ready yet
+        """
+        target_dir = Paths.get_cache_dir() / f"ct2-{model_name}-{compute_type}"
+        if (target_dir / "model.bin").exists():
+            return target_dir
+
+        if not get_config_manager().get_config().transcription_quantize_models:
+            return None
+
+        if target_dir in self._failed_conversions:
+            return None
+
+        if not shutil.which(CT2_CONVERTER) or importlib.util.find_spec("transformers") is None:
+            logger.info("Model quantization needs ct2-transformers-converter and transformers; skipping")
+            self._failed_conversions.add(target_dir)
+            return None
+
+        if self._conversion_thread and self._conversion_thread.is_alive():
+            return None
+
+        self._conversion_thread = threading.Thread(
+            target=self._convert_model,
+            args=(model_name, compute_type, target_dir),
+            daemon=True
+        )
+        self._conversion_thread.start()
+        return None
+
+    def _convert_model(self, model_name: str, compute_type: str, target_dir: Path) -> None:
+        """Convert and quantize a Whisper model into target_dir."""
+        # Another app process may be converting the same model
+        with file_lock(target_dir.with_suffix(".lock")):
+            if (target_dir / "model.bin").exists():
+                return
+
+            temp_dir = target_dir.with_name(target_dir.name + PART_SUFFIX)
+            cmd = [
+                CT2_CONVERTER,
+                "--model", f"openai/whisper-{WHISPER_MODELS.get(model_name, model_name)}",
+                "--output_dir", str(temp_dir),
+                "--quantization", compute_type,
+                "--copy_files", "tokenizer.json", "preprocessor_config.json",
+                "--force"
+            ]
+
+            logger.info(f"Quantizing Whisper model: {model_name} ({compute_type})")
+            try:
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    timeout=3600
+                )
+                if result.returncode != 0:
+                    logger.warning(f"Model quantization failed: {result.stderr.strip()}")
+                    self._failed_conversions.add(target_dir)
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+                    return
+
+                os.replace(temp_dir, target_dir)
+                logger.info(f"Quantized Whisper model saved: {target_dir}")
+
+            except Exception as e:
+                logger.warning(f"Model quantization failed: {e}")
+                self._failed_conversions.add(target_dir)
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _unload_model(self) -> None:
+        """Release the Whisper model and any GPU memory it holds."""
+        with self._loading_lock, self._model_lock:
+            if self._model is None:
+                return
+            self._model = None
+            self._pipeline = None
+            self._model_key = None
+
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+        logger.info("Unloaded Whisper model")
+
+    def _extract_audio_pcm(self, video_path: Path):
+        """
+        Extract audio from video using ffmpeg, decoded straight into memory.
+
+        ffmpeg writes raw 16kHz mono PCM to stdout, which faster-whisper
+        accepts as a float32 array, so no temporary WAV file is needed.
+
+        Returns:
+            numpy float32 array of samples, or None if extraction failed
+        """
+        ffmpeg = _ffmpeg_path()
+        if not ffmpeg:
             logger.error("ffmpeg not found in PATH")
-            return False
+            return None
 
         try:
-            # Extract audio as 16kHz mono WAV
+            import numpy as np
+
             cmd = [
-                "ffmpeg",
+                ffmpeg,
+                "-nostdin",
+                "-loglevel", "error",  # No banner or progress noise on stderr
                 "-i", str(video_path),
                 "-vn",  # No video
+                "-f", "s16le",
                 "-acodec", "pcm_s16le",
-                "-ar", "16000",
+                "-ar", str(SAMPLE_RATE),
                 "-ac", "1",
-                "-y",  # Overwrite
-                str(audio_path)
+                "-"
             ]
 
-            result = subprocess.run(
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 minute timeout
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
             )
+            try:
+                raw, errors = process.communicate(timeout=600)  # 10 minute timeout
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+
+            if process.returncode != 0:
+                # Only decoded on failure, and only the tail
+                tail = errors[-4096:].decode("utf-8", errors="replace").strip()
+                logger.error(f"ffmpeg error ({process.returncode}): {tail}")
+                return None
 
-            if result.returncode != 0:
-                logger.error(f"ffmpeg error: {result.stderr}")
-                return False
-
-            return audio_path.exists()
+            return np.frombuffer(raw, dtype=np.int16).astype(np.float32) * (1.0 / 32768.0)
 
         except subprocess.TimeoutExpired:
             logger.error("Audio extraction timed out")
-            return False
+            return None
         except Exception as e:
             logger.error(f"Audio extraction failed: {e}")
-            return False
+            return None
 
     def transcribe_video(
         self,
         video_path: Path,
         output_format: str = "txt",
-        language: str = "en"
+        language: str = "en",
+        audio=None
     ) -> Optional[str]:
         """
         Transcribe a single video file.
@@ -189,134 +428,243 @@ class TranscriptionManager:
             video_path: Path to the video file
             output_format: Output format (txt, srt, vtt, both)
             language: Language code or "auto" for auto-detect
+            audio: Audio already extracted with _extract_audio_pcm, if any
 
         Returns:
             Path to the transcript file, or None if failed
-        """
-        config_manager = get_config_manager()
-        config = config_manager.get_config()
 
-        # Load model if needed
-        if not self._load_model(config.transcription_model):
-            return None
+        Raises:
+            RuntimeError: If the Whisper model has not been loaded
+        """
+        if self._model is None:
+            raise RuntimeError("Whisper model not loaded")
 
-        video_path = Path(video_path)
         if not video_path.exists():
             logger.error(f"Video file not found: {video_path}")
             return None
 
         # Check if transcript already exists
-        txt_path = video_path.with_suffix(".txt")
-        srt_path = video_path.with_suffix(".srt")
-        vtt_path = video_path.with_suffix(".vtt")
-
-        if txt_path.exists():
-            logger.info(f"Transcript already exists: {txt_path}")
-            return str(txt_path)
-        if srt_path.exists():
-            logger.info(f"Transcript already exists: {srt_path}")
-            return str(srt_path)
-        if vtt_path.exists():
-            logger.info(f"Transcript already exists: {vtt_path}")
-            return str(vtt_path)
-
-        # Create audio temp file
-        audio_path = video_path.with_suffix(".wav")
+        existing = self._find_existing_transcript(video_path)
+        if existing:
+            logger.info(f"Transcript already exists: {existing}")
+            return str(existing)
 
-        try:
-            # Extract audio
+        # Extract audio
+        if audio is None:
             logger.info(f"Extracting audio from: {video_path.name}")
-            if not self._extract_audio(video_path, audio_path):
+            audio = self._extract_audio_pcm(video_path)
+            if audio is None:
                 return None
 
-            # Transcribe
-            logger.info(f"Transcribing: {video_path.name}")
-
-            # Handle auto language detection
-            transcribe_language = None if language == "auto" else language
+        # Transcribe
+        logger.info(f"Transcribing: {video_path.name}")
 
-            segments, info = self._model.transcribe(
-                str(audio_path),
-                language=transcribe_language,
-                beam_size=5,
-                vad_filter=True
-            )
+        # Handle auto language detection
+        transcribe_language = None if language == "auto" else language
+        folder_key = None
+        config_manager = get_config_manager()
+        if transcribe_language is None and config_manager.get_config().transcription_folder_language:
+            # Downloads are stored flat per source, so key on the Drive folder
+            # the video came from rather than its local directory
+            found = config_manager.find_file_by_local_path(str(video_path))
+            if found is not None:
+                folder_key = found[1].parent_id
+            if folder_key:
+                transcribe_language = self._folder_languages.get(folder_key)
+
+        options = {
+            "language": transcribe_language,
+            "beam_size": 5,
+            "vad_filter": True,
+            "vad_parameters": {"min_silence_duration_ms": 500},
+            "condition_on_previous_text": True,
+            "word_timestamps": False,
+            # Plain text needs no timestamp tokens; set explicitly either
+            # way since the batched pipeline defaults to no timestamps
+            "without_timestamps": output_format == "txt",
+        }
+
+        # (suffix, header, segment writer) for each output file
+        if output_format == "srt":
+            targets = [(".srt", "", self._write_srt_segment)]
+        elif output_format == "vtt":
+            targets = [(".vtt", "WEBVTT\n\n", self._write_vtt_segment)]
+        elif output_format == "both":
+            # Create both txt and srt files, txt is the primary
+            targets = [
+                (".txt", "", self._write_txt_segment),
+                (".srt", "", self._write_srt_segment),
+            ]
+        else:
+            targets = [(".txt", "", self._write_txt_segment)]
 
-            # Collect segments
-            all_segments = list(segments)
-
-            # Generate output based on format
-            if output_format == "srt":
-                transcript_path = video_path.with_suffix(".srt")
-                self._write_srt(all_segments, transcript_path)
-            elif output_format == "vtt":
-                transcript_path = video_path.with_suffix(".vtt")
-                self._write_vtt(all_segments, transcript_path)
-            elif output_format == "both":
-                # Create both txt and srt files
-                txt_path = video_path.with_suffix(".txt")
-                srt_path = video_path.with_suffix(".srt")
-                self._write_txt(all_segments, txt_path)
-                self._write_srt(all_segments, srt_path)
-                transcript_path = txt_path  # Return txt path as primary
-                logger.info(f"Transcript saved: {txt_path} and {srt_path}")
-            else:
-                transcript_path = video_path.with_suffix(".txt")
-                self._write_txt(all_segments, transcript_path)
+        output_paths = [video_path.with_suffix(suffix) for suffix, _, _ in targets]
+        part_paths = [path.with_name(path.name + PART_SUFFIX) for path in output_paths]
 
-            if output_format != "both":
-                logger.info(f"Transcript saved: {transcript_path}")
-            return str(transcript_path)
+        # Nothing worth decoding: a padded 30s encoder pass would be wasted
+        if len(audio) < MIN_SPEECH_SECONDS * SAMPLE_RATE or abs(audio).mean() < SILENCE_LEVEL:
+            logger.info(f"No speech in {video_path.name}, writing empty transcript")
+            for output_path, (_, header, _) in zip(output_paths, targets):
+                output_path.write_text(header, encoding="utf-8")
+                self._add_dir_entry(output_path)
+            return str(output_paths[0])
 
-        finally:
-            # Cleanup audio file
-            if audio_path.exists():
+        try:
+            # Segments are decoded lazily, so hold the lock while consuming
+            # them and write each one out as soon as it is produced
+            with self._model_lock, ExitStack() as stack:
+                if self._pipeline is not None:
+                    runner = self._pipeline
+                    options["batch_size"] = 8 if self._device == "cuda" else 4
+                else:
+                    runner = self._model
+
+                segments, info = runner.transcribe(audio, **options)
+
+                files = []
+                for part_path, (_, header, _) in zip(part_paths, targets):
+                    f = stack.enter_context(open(part_path, "w", encoding="utf-8"))
+                    f.write(header)
+                    files.append(f)
+
+                if folder_key and transcribe_language is None and info.language:
+                    self._folder_languages[folder_key] = info.language
+
+                duration = info.duration
+                last_progress = 0.0
+                for index, segment in enumerate(segments, 1):
+                    for f, (_, _, write_segment) in zip(files, targets):
+                        write_segment(f, index, segment)
+                    if self._on_progress and duration:
+                        fraction = min(segment.end / duration, 1.0)
+                        now = time.monotonic()
+                        if now - last_progress >= PROGRESS_INTERVAL or fraction >= 1.0:
+                            last_progress = now
+                            self._on_progress(video_path.name, fraction)
+
+            for part_path, output_path in zip(part_paths, output_paths):
+                os.replace(part_path, output_path)
+                self._add_dir_entry(output_path)
+
+        except BaseException:
+            for part_path in part_paths:
                 try:
-                    audio_path.unlink()
-                except Exception:
+                    part_path.unlink()
+                except OSError:
                     pass
+            raise
+
+        logger.info(f"Transcript saved: {' and '.join(str(p) for p in output_paths)}")
+        return str(output_paths[0])
+
+    def _find_existing_transcript(self, video_path: Path) -> Optional[Path]:
+        """Get an existing transcript for the video, if there is one."""
+        entries = self._get_dir_entries(video_path.parent)
+        for suffix in (".txt", ".srt", ".vtt"):
+            transcript_path = video_path.with_suffix(suffix)
+            if os.path.normcase(transcript_path.name) in entries:
+                return transcript_path
+        return None
+
+    def _get_dir_entries(self, directory: Path) -> Set[str]:
+        """Get the (cached) normalized file names in a directory."""
+        key = str(directory)
+        with self._dir_entries_lock:
+            entries = self._dir_entries.get(key)
+        if entries is not None:
+            return entries
 
-    def _write_txt(self, segments, output_path: Path) -> None:
-        """Write transcript as plain text."""
-        with open(output_path, "w", encoding="utf-8") as f:
-            for segment in segments:
-                f.write(segment.text.strip() + "\n")
-
-    def _write_srt(self, segments, output_path: Path) -> None:
-        """Write transcript as SRT subtitles."""
-        with open(output_path, "w", encoding="utf-8") as f:
-            for i, segment in enumerate(segments, 1):
-                start = self._format_timestamp_srt(segment.start)
-                end = self._format_timestamp_srt(segment.end)
-                f.write(f"{i}\n")
-                f.write(f"{start} --> {end}\n")
-                f.write(f"{segment.text.strip()}\n\n")
-
-    def _write_vtt(self, segments, output_path: Path) -> None:
-        """Write transcript as WebVTT subtitles."""
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("WEBVTT\n\n")
-            for segment in segments:
-                start = self._format_timestamp_vtt(segment.start)
-                end = self._format_timestamp_vtt(segment.end)
-                f.write(f"{start} --> {end}\n")
-                f.write(f"{segment.text.strip()}\n\n")
-
-    def _format_timestamp_srt(self, seconds: float) -> str:
-        """Format timestamp for SRT (HH:MM:SS,mmm)."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millis = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-
-    def _format_timestamp_vtt(self, seconds: float) -> str:
-        """Format timestamp for VTT (HH:MM:SS.mmm)."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millis = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+        try:
+            with os.scandir(directory) as it:
+                entries = {os.path.normcase(entry.name) for entry in it}
+        except OSError:
+            entries = set()
+
+        with self._dir_entries_lock:
+            return self._dir_entries.setdefault(key, entries)
+
+    def _add_dir_entry(self, path: Path) -> None:
+        """Record a newly written file in the directory cache."""
+        with self._dir_entries_lock:
+            entries = self._dir_entries.get(str(path.parent))
+            if entries is not None:
+                entries.add(os.path.normcase(path.name))
+
+    def _clear_dir_entries(self) -> None:
+        """Forget cached directory listings."""
+        with self._dir_entries_lock:
+            self._dir_entries.clear()
+
+    def _write_txt_segment(self, f, index: int, segment) -> None:
+        """Write one segment as plain text."""
+        f.write(segment.text.strip() + "\n")
+
+    def _write_srt_segment(self, f, index: int, segment) -> None:
+        """Write one segment as an SRT cue."""
+        start = self._format_timestamp(segment.start, ",")
+        end = self._format_timestamp(segment.end, ",")
+        f.write(f"{index}\n")
+        f.write(f"{start} --> {end}\n")
+        f.write(f"{segment.text.strip()}\n\n")
+
+    def _write_vtt_segment(self, f, index: int, segment) -> None:
+        """Write one segment as a WebVTT cue."""
+        start = self._format_timestamp(segment.start, ".")
+        end = self._format_timestamp(segment.end, ".")
+        f.write(f"{start} --> {end}\n")
+        f.write(f"{segment.text.strip()}\n\n")
+
+    @staticmethod
+    def _format_timestamp(seconds: float, separator: str) -> str:
+        """Format timestamp as HH:MM:SS<separator>mmm (',' for SRT, '.' for VTT)."""
+        # Round to integer milliseconds first; float modulo truncates
+        # (3661.2s used to come out as 01:01:01,199)
+        total_ms = int(seconds * 1000 + 0.5)
+        secs, millis = divmod(total_ms, 1000)
+        minutes, secs = divmod(secs, 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+    def _release_gpu_memory_if_low(self) -> None:
+        """Empty the CUDA cache, but only when free GPU memory is running low."""
+        if self._device != "cuda":
+            return
+
+        try:
+            import torch
+            free, total = torch.cuda.mem_get_info()
+            if total and free / total < GPU_FREE_THRESHOLD:
+                torch.cuda.empty_cache()
+                if not self._logged_gpu_release:
+                    logger.info(f"GPU memory low ({free / total:.0%} free), released cached memory")
+                    self._logged_gpu_release = True
+        except Exception:
+            pass
+
+    def prewarm_model(self) -> None:
+        """Load the configured Whisper model in the background, ahead of the first batch."""
+        def prewarm():
+            is_ready, _ = self.is_transcription_ready()
+            if not is_ready:
+                return
+            config = get_config_manager().get_config()
+            if self._load_model(
+                config.transcription_model,
+                config.transcription_compute_type,
+                config.transcription_cpu_threads
+            ):
+                # Batches unload the model when they finish; don't keep it
+                # for the rest of the session if no batch ever starts
+                timer = threading.Timer(PREWARM_IDLE_UNLOAD, self._unload_if_idle)
+                timer.daemon = True
+                timer.start()
+
+        threading.Thread(target=prewarm, daemon=True).start()
+
+    def _unload_if_idle(self) -> None:
+        """Unload a pre-warmed model unless a batch is using it."""
+        if not self._is_transcribing:
+            self._unload_model()
 
     def transcribe_all_pending(self) -> None:
         """Transcribe all pending videos in background thread."""
@@ -351,6 +699,12 @@ class TranscriptionManager:
         self._is_transcribing = False
         self._should_stop = False
         self._current_file = None
+        self._unload_model()
+        # Pick up an ffmpeg (or converter) installed while the app was running
+        _ffmpeg_path.cache_clear()
+        self._failed_conversions.clear()
+        self._clear_dir_entries()
+        self._folder_languages.clear()
 
     def _transcription_worker(self) -> None:
         """Worker thread for transcribing videos."""
@@ -365,15 +719,40 @@ class TranscriptionManager:
             self._is_transcribing = False
             return
 
+        # Load the model once for the whole batch
+        if not self._load_model(
+            config.transcription_model,
+            config.transcription_compute_type,
+            config.transcription_cpu_threads
+        ):
+            logger.error("Transcription skipped: Whisper model unavailable")
+            self._is_transcribing = False
+            return
+
+        # Transcripts may have been added or removed since the last batch
+        self._clear_dir_entries()
+
         notify_transcription_started(len(pending_videos))
         completed_count = 0
         failed_count = 0
 
-        for video_path in pending_videos:
-            if self._should_stop:
+        # ffmpeg decodes upcoming videos while Whisper works on the current one
+        audio_queue: queue.Queue = queue.Queue(maxsize=EXTRACT_QUEUE_SIZE)
+        extractor = threading.Thread(
+            target=self._extraction_worker,
+            args=(pending_videos, audio_queue),
+            daemon=True
+        )
+        extractor.start()
+
+        while not self._should_stop:
+            item = self._get_until_stopped(audio_queue, extractor)
+            if item is None:
                 break
+            video_path, path, audio, extracted = item
+            name = path.name
 
-            self._current_file = Path(video_path).name
+            self._current_file = name
 
             if self._on_progress:
                 self._on_progress(self._current_file, 0.0)
@@ -386,11 +765,16 @@ class TranscriptionManager:
             self._update_file_transcription_status(config_manager, video_path, "transcribing")
 
             try:
-                transcript_path = self.transcribe_video(
-                    Path(video_path),
-                    output_format=config.transcription_output_format,
-                    language=config.transcription_language
-                )
+                if extracted and audio is None:
+                    # Audio extraction failed, already logged
+                    transcript_path = None
+                else:
+                    transcript_path = self.transcribe_video(
+                        path,
+                        output_format=config.transcription_output_format,
+                        language=config.transcription_language,
+                        audio=audio
+                    )
 
                 if transcript_path:
                     state.status = "complete"
@@ -407,7 +791,7 @@ class TranscriptionManager:
                     if self._on_complete:
                         self._on_complete(video_path, transcript_path)
 
-                    notify_transcription_file_complete(Path(video_path).name)
+                    notify_transcription_file_complete(name)
                 else:
                     state.status = "error"
                     state.error_message = "Transcription failed"
@@ -431,11 +815,13 @@ class TranscriptionManager:
                 if self._on_error:
                     self._on_error(video_path, str(e))
 
-                notify_transcription_error(Path(video_path).name, str(e))
+                notify_transcription_error(name, str(e))
 
             config_manager.update_transcription(state)
+            self._release_gpu_memory_if_low()
 
         self._current_file = None
+        self._unload_model()
         self._is_transcribing = False
 
         logger.info(f"Transcription complete: {completed_count}/{len(pending_videos)}")
@@ -443,6 +829,51 @@ class TranscriptionManager:
         # Show batch completion notification
         notify_transcription_batch_complete(completed_count, failed_count)
 
+    def _extraction_worker(self, pending_videos: List[str], audio_queue: queue.Queue) -> None:
+        """Extract audio for each pending video ahead of the transcriber."""
+        for video_path in pending_videos:
+            if self._should_stop:
+                break
+
+            path = Path(video_path)
+            audio = None
+            extracted = False
+            if path.exists() and self._find_existing_transcript(path) is None:
+                logger.info(f"Extracting audio from: {path.name}")
+                audio = self._extract_audio_pcm(path)
+                extracted = True
+
+            if not self._put_until_stopped(audio_queue, (video_path, path, audio, extracted)):
+                return
+
+        self._put_until_stopped(audio_queue, None)
+
+    def _put_until_stopped(self, audio_queue: queue.Queue, item) -> bool:
+        """Put item on the queue, giving up if transcription is stopped."""
+        while not self._should_stop:
+            try:
+                audio_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get_until_stopped(self, audio_queue: queue.Queue, extractor: threading.Thread):
+        """
+        Take the next item off the queue, giving up if transcription is
+        stopped or the extractor exited without sending its None sentinel.
+
+        Returns:
+            The next item, or None when there is nothing more to transcribe
+        """
+        while not self._should_stop:
+            try:
+                return audio_queue.get(timeout=0.5)
+            except queue.Empty:
+                if not extractor.is_alive() and audio_queue.empty():
+                    return None
+        return None
+
     def _update_file_transcription_status(
         self,
         config_manager,
@@ -451,50 +882,49 @@ class TranscriptionManager:
         transcribed_at: Optional[str] = None
     ) -> None:
         """Update the FileState's transcription status."""
-        # Find the file in drive or photos state
-        for file_state in config_manager.get_drive_state().values():
-            if file_state.local_path == video_path:
-                file_state.transcription_status = status
-                if transcribed_at:
-                    file_state.transcribed_at = transcribed_at
-                config_manager.update_drive_file(file_state)
-                return
+        found = config_manager.find_file_by_local_path(video_path)
+        if found is None:
+            return
 
-        for file_state in config_manager.get_photos_state().values():
-            if file_state.local_path == video_path:
-                file_state.transcription_status = status
-                if transcribed_at:
-                    file_state.transcribed_at = transcribed_at
-                config_manager.update_photos_file(file_state)
-                return
+        source, file_state = found
+        file_state.transcription_status = status
+        if transcribed_at:
+            file_state.transcribed_at = transcribed_at
+
+        # Final states are always saved; "transcribing" at most every few seconds
+        now = time.monotonic()
+        save = status in ("complete", "error") or now - self._last_status_save >= STATUS_SAVE_INTERVAL
+        if save:
+            self._last_status_save = now
+
+        if source == "drive":
+            config_manager.update_drive_file(file_state, save=save)
+        else:
+            config_manager.update_photos_file(file_state, save=save)
 
     def get_pending_videos(self) -> List[str]:
         """Get list of videos pending transcription."""
         config_manager = get_config_manager()
         transcription_state = config_manager.get_transcription_state()
-        pending = []
-
-        # Get all completed video downloads
-        for file_state in config_manager.get_drive_state().values():
-            if file_state.status == "complete" and file_state.mime_type.startswith("video/"):
-                if file_state.local_path:
-                    # Check if not already transcribed
-                    trans = transcription_state.get(file_state.local_path)
-                    if not trans or trans.status == "pending":
-                        pending.append(file_state.local_path)
-
-        for file_state in config_manager.get_photos_state().values():
-            if file_state.status == "complete" and file_state.mime_type.startswith("video/"):
-                if file_state.local_path:
-                    trans = transcription_state.get(file_state.local_path)
-                    if not trans or trans.status == "pending":
-                        pending.append(file_state.local_path)
-
-        return pending
+
+        # Completed video downloads not already transcribed
+        return [
+            path for path in config_manager.get_downloaded_video_paths()
+            if (trans := transcription_state.get(path)) is None or trans.status == "pending"
+        ]
 
     def get_pending_count(self) -> int:
-        """Get count of videos pending transcription."""
-        return len(self.get_pending_videos())
+        """Get count of videos pending transcription (cached until state changes)."""
+        config_manager = get_config_manager()
+        version = config_manager.state_version
+
+        cache = self._pending_count_cache
+        if cache is not None and cache[0] == version:
+            return cache[1]
+
+        count = len(self.get_pending_videos())
+        self._pending_count_cache = (version, count)
+        return count
 
 
 # Singleton instance
@@ -1,6 +1,3 @@
 # UI components
-from .system_tray import SystemTray, get_system_tray
-from .main_window import MainWindow, get_main_window
-from .auth_window import AuthWindow, show_auth_dialog
-from .config_window import ConfigWindow, show_config_dialog
-from .progress_dialog import ProgressDialog, show_progress
+# Import submodules directly (e.g. src.ui.main_window) so that importing the
+# package does not pull in every window and the system tray dependencies.
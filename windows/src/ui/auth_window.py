@@ -14,10 +14,39 @@ except ImportError:
     from tkinter import ttk
     CTK_AVAILABLE = False
 
-from utils.logger import get_logger
+from ..utils.logger import get_logger
 
 logger = get_logger()
 
+# Set once the background import of the OAuth libraries has been started
+_preload_started = False
+_preload_lock = threading.Lock()
+
+
+def _preload_auth_libraries() -> None:
+    """Import the OAuth flow and its Google auth dependencies."""
+    try:
+        import google_auth_oauthlib.flow  # noqa: F401
+        import google.auth.transport.requests  # noqa: F401
+    except ImportError:
+        pass
+
+
+def preload_in_background() -> None:
+    """
+    Start importing the OAuth libraries on a background thread.
+
+    Called while the user hasn't clicked "Sign in" yet, so the import
+    (a few hundred ms) is done before the sign-in thread needs it.
+    """
+    global _preload_started
+    with _preload_lock:
+        if _preload_started:
+            return
+        _preload_started = True
+
+    threading.Thread(target=_preload_auth_libraries, daemon=True).start()
+
 
 class AuthWindow:
     """Window shown during authentication process."""
@@ -156,7 +185,7 @@ class AuthWindow:
     def _start_auth(self) -> None:
         """Start the authentication process in a background thread."""
         def auth_thread():
-            from core.google_auth import get_auth_manager
+            from ..core.google_auth import get_auth_manager
 
             auth_manager = get_auth_manager()
 
@@ -178,28 +207,20 @@ class AuthWindow:
         if self.progress:
             self.progress.stop()
 
+        # CTk and Tk widgets both accept configure(), so no toolkit branch
         if success:
             if self.status_label:
-                if CTK_AVAILABLE:
-                    self.status_label.configure(text="Successfully signed in!")
-                else:
-                    self.status_label.config(text="Successfully signed in!")
+                self.status_label.configure(text="Successfully signed in!")
 
             # Close window after short delay
             if self.window:
                 self.window.after(1500, self._close)
         else:
             if self.status_label:
-                if CTK_AVAILABLE:
-                    self.status_label.configure(text=f"Sign-in failed:\n{message}")
-                else:
-                    self.status_label.config(text=f"Sign-in failed:\n{message}")
+                self.status_label.configure(text=f"Sign-in failed:\n{message}")
 
             if self.cancel_btn:
-                if CTK_AVAILABLE:
-                    self.cancel_btn.configure(text="Close")
-                else:
-                    self.cancel_btn.config(text="Close")
+                self.cancel_btn.configure(text="Close")
 
         if self._on_complete:
             self._on_complete(success, message)
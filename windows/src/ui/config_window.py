@@ -3,9 +3,12 @@ Configuration/preferences window for Google Media Backup.
 """
 
 import os
+import threading
+import time
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional, Callable
-from tkinter import filedialog
+from typing import Optional, Callable, Dict, Tuple
+from tkinter import filedialog, TclError
 
 try:
     import customtkinter as ctk
@@ -15,29 +18,164 @@ except ImportError:
     from tkinter import ttk
     CTK_AVAILABLE = False
 
-from utils.config import get_config_manager, AppConfig
-from utils.paths import Paths
-from utils.logger import get_logger
+from ..utils.config import get_config_manager, AppConfig
+from ..utils.paths import Paths
+from ..utils.logger import get_logger
+from ..core.google_auth import get_auth_manager
+from ..core.transcription import TranscriptionManager
+from .auth_window import show_auth_dialog
 
 logger = get_logger()
 
+# Seconds a status probe stays valid, so reopening Preferences is instant
+STATUS_CACHE_TTL = 5.0
+
+# (monotonic time, value) of the last auth and transcription status probes
+_auth_status_cache: Optional[Tuple[float, Tuple[bool, str, str]]] = None
+_whisper_status_cache: Optional[Tuple[float, Tuple[bool, str]]] = None
+
+
+def _get_auth_status_cached() -> Tuple[bool, str, str]:
+    """
+    Get the Google account status, re-checking at most every STATUS_CACHE_TTL.
+
+    Returns:
+        Tuple of (is_authenticated, status_text, status_color)
+    """
+    global _auth_status_cache
+    now = time.monotonic()
+    if _auth_status_cache is not None and now - _auth_status_cache[0] < STATUS_CACHE_TTL:
+        return _auth_status_cache[1]
+
+    if get_auth_manager().is_authenticated:
+        status = (True, "Connected to Google", "#4CAF50")
+    else:
+        status = (False, "Not signed in", "#9E9E9E")
+
+    _auth_status_cache = (now, status)
+    return status
+
+
+def _invalidate_auth_status() -> None:
+    """Forget the cached auth status after signing in or out."""
+    global _auth_status_cache
+    _auth_status_cache = None
+
+
+def _get_whisper_status_cached(probe: bool = True) -> Optional[Tuple[bool, str]]:
+    """
+    Get transcription readiness, re-checking at most every STATUS_CACHE_TTL.
+
+    Args:
+        probe: Run the check if the cached value is stale; if False,
+               return None instead
+
+    Returns:
+        Tuple of (is_ready, status_message), or None
+    """
+    global _whisper_status_cache
+    now = time.monotonic()
+    if _whisper_status_cache is not None and now - _whisper_status_cache[0] < STATUS_CACHE_TTL:
+        return _whisper_status_cache[1]
+    if not probe:
+        return None
+
+    status = TranscriptionManager.is_transcription_ready()
+
+    _whisper_status_cache = (now, status)
+    return status
+
 
 class ConfigWindow:
     """Preferences/settings window."""
 
+    _font_cache: Optional[Dict[str, "ctk.CTkFont"]] = None
+
+    # (Tk variable attribute, variable kind, AppConfig field) for each
+    # setting shown in the window; drives creating, loading and saving
+    _SETTINGS = (
+        ("path_var", "str", "download_path"),
+        ("videos_var", "bool", "download_videos"),
+        ("documents_var", "bool", "download_documents"),
+        ("photos_var", "bool", "download_photos"),
+        ("auto_download_var", "bool", "auto_download"),
+        ("auto_transcribe_var", "bool", "auto_transcribe"),
+        ("model_var", "str", "transcription_model"),
+        ("compute_type_var", "str", "transcription_compute_type"),
+        ("format_var", "str", "transcription_output_format"),
+        ("language_var", "str", "transcription_language"),
+        ("folder_language_var", "bool", "transcription_folder_language"),
+    )
+
+    # (label, Tk variable attribute, vertical padding) for the checkboxes
+    # in grid rows 5-8 of the main frame
+    _CONTENT_CHECKBOXES = (
+        ("Videos", "videos_var", 2),
+        ("Documents", "documents_var", 2),
+        ("Google Photos Videos", "photos_var", 2),
+        ("Auto-download on startup", "auto_download_var", (15, 2)),
+    )
+
+    # Rows of the Transcription section, top to bottom:
+    #   ("check", label, variable attribute)
+    #   ("menu", label, variable attribute, choices)
+    #   ("hint", text)
+    #   ("status",) - transcription readiness, probed off the UI thread
+    _TRANSCRIPTION_LAYOUT = (
+        ("check", "Auto-transcribe videos after download", "auto_transcribe_var"),
+        ("menu", "Whisper Model:", "model_var", ("tiny", "base", "small", "medium")),
+        ("hint", "Larger models are more accurate but slower"),
+        ("menu", "Compute Type:", "compute_type_var",
+         ("auto", "int8", "int8_float16", "float16", "bfloat16")),
+        ("status",),
+        ("menu", "Output Format:", "format_var", ("txt", "srt", "vtt", "both")),
+        ("hint", "'both' creates both .txt and .srt files"),
+        ("menu", "Language:", "language_var", ("en", "auto")),
+        ("hint", "'auto' will detect the language automatically"),
+        ("check", "Assume consistent language per Drive folder", "folder_language_var"),
+    )
+
     def __init__(self, parent=None):
         self.parent = parent
         self.window: Optional[ctk.CTkToplevel] = None
         self._on_save: Optional[Callable[[AppConfig], None]] = None
 
+    @classmethod
+    def _fonts(cls) -> Dict[str, "ctk.CTkFont"]:
+        """
+        Get the window's fonts, created once per process.
+
+        Must first be called after the Tk root exists.
+        """
+        if cls._font_cache is None:
+            cls._font_cache = {
+                "title": ctk.CTkFont(size=20, weight="bold"),
+                "bold": ctk.CTkFont(weight="bold"),
+                "hint": ctk.CTkFont(size=11),
+            }
+        return cls._font_cache
+
     def show(self, on_save: Optional[Callable[[AppConfig], None]] = None) -> None:
         """Show the configuration window."""
         self._on_save = on_save
 
         if self.window is not None:
-            self.window.deiconify()
-            self.window.lift()
-            return
+            try:
+                window_exists = bool(self.window.winfo_exists())
+            except TclError:
+                window_exists = False
+
+            if window_exists:
+                # Reopened after being hidden: show current settings and account
+                if CTK_AVAILABLE:
+                    self._load_values(get_config_manager().get_config())
+                    self._refresh_auth_ui()
+                self.window.deiconify()
+                self.window.lift()
+                return
+
+            # Destroyed behind our back (e.g. with its parent); build anew
+            self.window = None
 
         self._create_window()
 
@@ -57,83 +195,67 @@ class ConfigWindow:
             else:
                 self.window = tk.Tk()
 
+        # Hidden while the widgets are built, so it is laid out and drawn once
+        self.window.withdraw()
+
         self.window.title("Preferences")
-        self.window.geometry("500x720")
         self.window.resizable(False, False)
 
-        # Center on screen
-        self.window.update_idletasks()
+        # The title bar close button hides the window like Cancel does
+        self.window.protocol("WM_DELETE_WINDOW", self._close)
+
+        # Center on screen; the screen size needs no idle-task flush
         x = (self.window.winfo_screenwidth() - 500) // 2
-        y = (self.window.winfo_screenheight() - 720) // 2
-        self.window.geometry(f"500x720+{x}+{y}")
+        y = (self.window.winfo_screenheight() - 800) // 2
+        self.window.geometry(f"500x800+{x}+{y}")
 
         if not CTK_AVAILABLE:
+            self.window.deiconify()
             return
 
-        # Main frame with padding
+        # One Tk variable per setting
+        for attr, kind, field_name in self._SETTINGS:
+            var_type = ctk.BooleanVar if kind == "bool" else ctk.StringVar
+            setattr(self, attr, var_type(value=getattr(config, field_name)))
+
+        # Main frame with padding; its children are placed with grid, one
+        # row each, with the spacer row taking any extra height
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        main_frame.grid_columnconfigure(0, weight=1)
+        main_frame.grid_rowconfigure(11, weight=1)
 
         # Title
         title = ctk.CTkLabel(
             main_frame,
             text="Preferences",
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=self._fonts()["title"]
         )
-        title.pack(pady=(0, 20), anchor="w")
+        title.grid(row=0, column=0, sticky="w", pady=(0, 20))
 
         # Google Account Section
         account_label = ctk.CTkLabel(
             main_frame,
             text="Google Account:",
-            font=ctk.CTkFont(weight="bold")
+            font=self._fonts()["bold"]
         )
-        account_label.pack(anchor="w")
+        account_label.grid(row=1, column=0, sticky="w")
 
         account_frame = ctk.CTkFrame(main_frame)
-        account_frame.pack(fill="x", pady=(5, 15))
-
-        # Check auth status
-        from core.google_auth import get_auth_manager
-        auth_manager = get_auth_manager()
-        is_authenticated = auth_manager.is_authenticated
+        account_frame.grid(row=2, column=0, sticky="ew", pady=(5, 15))
 
-        if is_authenticated:
-            status_text = "Connected to Google"
-            status_color = "#4CAF50"
-        else:
-            status_text = "Not signed in"
-            status_color = "#9E9E9E"
+        # Auth status; text, colors and command are set by _refresh_auth_ui
+        self.status_label = ctk.CTkLabel(account_frame, text="")
+        self.status_label.pack(side="left", padx=15, pady=10)
 
-        status_label = ctk.CTkLabel(
-            account_frame,
-            text=status_text,
-            text_color=status_color
-        )
-        status_label.pack(side="left", padx=15, pady=10)
+        self.auth_button = ctk.CTkButton(account_frame, text="", width=80)
+        self.auth_button.pack(side="right", padx=15, pady=10)
 
-        if is_authenticated:
-            sign_out_btn = ctk.CTkButton(
-                account_frame,
-                text="Sign Out",
-                width=80,
-                fg_color="#F44336",
-                hover_color="#D32F2F",
-                command=self._sign_out
-            )
-            sign_out_btn.pack(side="right", padx=15, pady=10)
-        else:
-            sign_in_btn = ctk.CTkButton(
-                account_frame,
-                text="Sign In",
-                width=80,
-                command=self._sign_in
-            )
-            sign_in_btn.pack(side="right", padx=15, pady=10)
+        self._refresh_auth_ui()
 
         # Download Path
         path_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        path_frame.pack(fill="x", pady=10)
+        path_frame.grid(row=3, column=0, sticky="ew", pady=10)
 
         path_label = ctk.CTkLabel(path_frame, text="Download Location:")
         path_label.pack(anchor="w")
@@ -141,7 +263,6 @@ class ConfigWindow:
         path_entry_frame = ctk.CTkFrame(path_frame, fg_color="transparent")
         path_entry_frame.pack(fill="x", pady=5)
 
-        self.path_var = ctk.StringVar(value=config.download_path)
         path_entry = ctk.CTkEntry(path_entry_frame, textvariable=self.path_var, width=350)
         path_entry.pack(side="left", fill="x", expand=True)
 
@@ -157,195 +278,198 @@ class ConfigWindow:
         content_label = ctk.CTkLabel(
             main_frame,
             text="Content to Download:",
-            font=ctk.CTkFont(weight="bold")
+            font=self._fonts()["bold"]
         )
-        content_label.pack(pady=(20, 10), anchor="w")
-
-        self.videos_var = ctk.BooleanVar(value=config.download_videos)
-        videos_cb = ctk.CTkCheckBox(main_frame, text="Videos", variable=self.videos_var)
-        videos_cb.pack(anchor="w", pady=2)
-
-        self.documents_var = ctk.BooleanVar(value=config.download_documents)
-        documents_cb = ctk.CTkCheckBox(main_frame, text="Documents", variable=self.documents_var)
-        documents_cb.pack(anchor="w", pady=2)
-
-        self.photos_var = ctk.BooleanVar(value=config.download_photos)
-        photos_cb = ctk.CTkCheckBox(main_frame, text="Google Photos Videos", variable=self.photos_var)
-        photos_cb.pack(anchor="w", pady=2)
-
-        # Auto-download
-        self.auto_download_var = ctk.BooleanVar(value=config.auto_download)
-        auto_download_cb = ctk.CTkCheckBox(
-            main_frame,
-            text="Auto-download on startup",
-            variable=self.auto_download_var
-        )
-        auto_download_cb.pack(anchor="w", pady=(15, 2))
-
-        # Transcription section
-        trans_label = ctk.CTkLabel(
+        content_label.grid(row=4, column=0, sticky="w", pady=(20, 10))
+
+        for row, (text, attr, pady) in enumerate(self._CONTENT_CHECKBOXES, start=5):
+            ctk.CTkCheckBox(
+                main_frame, text=text, variable=getattr(self, attr)
+            ).grid(row=row, column=0, sticky="w", pady=pady)
+
+        # Transcription section, collapsed until first expanded. Its
+        # variables already exist, so Save works without expanding it.
+        self._main_frame = main_frame
+        self._transcription_frame = None
+        self._transcription_expanded = False
+        self._transcription_toggle = ctk.CTkButton(
             main_frame,
-            text="Transcription:",
-            font=ctk.CTkFont(weight="bold")
-        )
-        trans_label.pack(pady=(20, 10), anchor="w")
-
-        self.auto_transcribe_var = ctk.BooleanVar(value=config.auto_transcribe)
-        auto_trans_cb = ctk.CTkCheckBox(
-            main_frame,
-            text="Auto-transcribe videos after download",
-            variable=self.auto_transcribe_var
+            text="Transcription ▸",
+            font=self._fonts()["bold"],
+            fg_color="transparent",
+            text_color=("gray10", "gray90"),
+            hover=False,
+            anchor="w",
+            command=self._toggle_transcription
         )
-        auto_trans_cb.pack(anchor="w", pady=2)
+        self._transcription_toggle.grid(row=9, column=0, sticky="ew", pady=(20, 10))
 
-        # Model selection
-        model_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        model_frame.pack(fill="x", pady=10)
+        # Spacer
+        spacer = ctk.CTkFrame(main_frame, fg_color="transparent")
+        spacer.grid(row=11, column=0, sticky="nsew")
 
-        model_label = ctk.CTkLabel(model_frame, text="Whisper Model:")
-        model_label.pack(side="left")
+        # Buttons
+        button_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        button_frame.grid(row=12, column=0, sticky="ew", pady=10)
 
-        self.model_var = ctk.StringVar(value=config.transcription_model)
-        model_menu = ctk.CTkOptionMenu(
-            model_frame,
-            values=["tiny", "base", "small", "medium"],
-            variable=self.model_var
+        save_btn = ctk.CTkButton(
+            button_frame,
+            text="Save",
+            command=self._save
         )
-        model_menu.pack(side="left", padx=10)
+        save_btn.pack(side="right", padx=5)
 
-        model_hint = ctk.CTkLabel(
-            main_frame,
-            text="Larger models are more accurate but slower",
-            font=ctk.CTkFont(size=11),
-            text_color="gray"
+        cancel_btn = ctk.CTkButton(
+            button_frame,
+            text="Cancel",
+            command=self._close,
+            fg_color="transparent",
+            border_width=1
         )
-        model_hint.pack(anchor="w")
+        cancel_btn.pack(side="right", padx=5)
+
+        self.window.deiconify()
 
-        # Whisper status
-        from core.transcription import TranscriptionManager
-        is_ready, status_msg = TranscriptionManager.is_transcription_ready()
+    def _toggle_transcription(self) -> None:
+        """Expand or collapse the Transcription section."""
+        if self._transcription_frame is None:
+            # Built on first expand, after the toggle has redrawn
+            self._transcription_frame = ctk.CTkFrame(self._main_frame, fg_color="transparent")
+            self.window.after_idle(self._build_transcription_section, self._transcription_frame)
 
-        whisper_status_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        if self._transcription_expanded:
+            self._transcription_frame.grid_remove()
+            self._transcription_toggle.configure(text="Transcription ▸")
+        else:
+            # Row 10, between the toggle and the spacer
+            self._transcription_frame.grid(row=10, column=0, sticky="ew")
+            self._transcription_toggle.configure(text="Transcription ▾")
+        self._transcription_expanded = not self._transcription_expanded
+
+    def _build_transcription_section(self, parent) -> None:
+        """Create the Transcription settings widgets inside parent."""
+        for kind, *spec in self._TRANSCRIPTION_LAYOUT:
+            if kind == "check":
+                text, attr = spec
+                ctk.CTkCheckBox(
+                    parent, text=text, variable=getattr(self, attr)
+                ).pack(anchor="w", pady=2)
+            elif kind == "menu":
+                text, attr, values = spec
+                row = ctk.CTkFrame(parent, fg_color="transparent")
+                row.pack(fill="x", pady=10)
+                ctk.CTkLabel(row, text=text).pack(side="left")
+                ctk.CTkOptionMenu(
+                    row, values=list(values), variable=getattr(self, attr)
+                ).pack(side="left", padx=10)
+            elif kind == "hint":
+                ctk.CTkLabel(
+                    parent, text=spec[0], font=self._fonts()["hint"], text_color="gray"
+                ).pack(anchor="w")
+            elif kind == "status":
+                self._build_whisper_status(parent)
+
+    def _build_whisper_status(self, parent) -> None:
+        """Create the transcription readiness row inside parent."""
+        whisper_status_frame = ctk.CTkFrame(parent, fg_color="transparent")
         whisper_status_frame.pack(fill="x", pady=5)
 
         whisper_status_label = ctk.CTkLabel(
             whisper_status_frame,
             text="Status: ",
-            font=ctk.CTkFont(size=11)
+            font=self._fonts()["hint"]
         )
         whisper_status_label.pack(side="left")
 
-        if is_ready:
-            status_color = "#4CAF50"
-        else:
-            status_color = "#FF9800"
-
         whisper_status_value = ctk.CTkLabel(
             whisper_status_frame,
-            text=status_msg,
-            font=ctk.CTkFont(size=11),
-            text_color=status_color
-        )
-        whisper_status_value.pack(side="left")
-
-        # Output format
-        format_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        format_frame.pack(fill="x", pady=10)
-
-        format_label = ctk.CTkLabel(format_frame, text="Output Format:")
-        format_label.pack(side="left")
-
-        self.format_var = ctk.StringVar(value=config.transcription_output_format)
-        format_menu = ctk.CTkOptionMenu(
-            format_frame,
-            values=["txt", "srt", "vtt", "both"],
-            variable=self.format_var
-        )
-        format_menu.pack(side="left", padx=10)
-
-        format_hint = ctk.CTkLabel(
-            main_frame,
-            text="'both' creates both .txt and .srt files",
-            font=ctk.CTkFont(size=11),
+            text="Checking…",
+            font=self._fonts()["hint"],
             text_color="gray"
         )
-        format_hint.pack(anchor="w")
-
-        # Language selection
-        lang_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        lang_frame.pack(fill="x", pady=10)
-
-        lang_label = ctk.CTkLabel(lang_frame, text="Language:")
-        lang_label.pack(side="left")
+        whisper_status_value.pack(side="left")
 
-        self.language_var = ctk.StringVar(value=config.transcription_language)
-        lang_menu = ctk.CTkOptionMenu(
-            lang_frame,
-            values=["en", "auto"],
-            variable=self.language_var
-        )
-        lang_menu.pack(side="left", padx=10)
+        # The check may import faster-whisper, so run it off the UI thread
+        # unless a recent result is cached
+        cached_status = _get_whisper_status_cached(probe=False)
+        if cached_status is not None:
+            self._show_whisper_status(whisper_status_value, *cached_status)
+        else:
+            threading.Thread(
+                target=self._probe_whisper_status,
+                args=(whisper_status_value,),
+                daemon=True
+            ).start()
+
+    def _probe_whisper_status(self, status_label) -> None:
+        """Check transcription readiness and show it (runs on a worker thread)."""
+        is_ready, status_msg = _get_whisper_status_cached()
+        if self.window:
+            self.window.after(0, lambda: self._show_whisper_status(status_label, is_ready, status_msg))
 
-        lang_hint = ctk.CTkLabel(
-            main_frame,
-            text="'auto' will detect the language automatically",
-            font=ctk.CTkFont(size=11),
-            text_color="gray"
+    def _show_whisper_status(self, status_label, is_ready: bool, status_msg: str) -> None:
+        """Show the transcription readiness in the status label."""
+        if not status_label.winfo_exists():
+            return
+        status_label.configure(
+            text=status_msg,
+            text_color="#4CAF50" if is_ready else "#FF9800"
         )
-        lang_hint.pack(anchor="w")
 
-        # Spacer
-        spacer = ctk.CTkFrame(main_frame, fg_color="transparent")
-        spacer.pack(fill="both", expand=True)
-
-        # Buttons
-        button_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        button_frame.pack(fill="x", pady=10)
+    def _refresh_auth_ui(self) -> None:
+        """Update the account status label and Sign In/Out button in place."""
+        is_authenticated, status_text, status_color = _get_auth_status_cached()
+        self.status_label.configure(text=status_text, text_color=status_color)
 
-        save_btn = ctk.CTkButton(
-            button_frame,
-            text="Save",
-            command=self._save
-        )
-        save_btn.pack(side="right", padx=5)
+        if is_authenticated:
+            self.auth_button.configure(
+                text="Sign Out",
+                fg_color="#F44336",
+                hover_color="#D32F2F",
+                command=self._sign_out
+            )
+        else:
+            button_theme = ctk.ThemeManager.theme["CTkButton"]
+            self.auth_button.configure(
+                text="Sign In",
+                fg_color=button_theme["fg_color"],
+                hover_color=button_theme["hover_color"],
+                command=self._sign_in
+            )
 
-        cancel_btn = ctk.CTkButton(
-            button_frame,
-            text="Cancel",
-            command=self._close,
-            fg_color="transparent",
-            border_width=1
-        )
-        cancel_btn.pack(side="right", padx=5)
+    def _load_values(self, config: AppConfig) -> None:
+        """Reset the settings widgets to the saved configuration."""
+        for attr, _, field_name in self._SETTINGS:
+            getattr(self, attr).set(getattr(config, field_name))
 
     def _sign_in(self) -> None:
         """Handle sign in from preferences."""
-        from ui.auth_window import show_auth_dialog
-
         def on_complete(success: bool, message: str):
-            # Refresh the preferences window
+            _invalidate_auth_status()
             if self.window:
-                self._close()
-                self.show(self._on_save)
+                self._refresh_auth_ui()
 
         show_auth_dialog(self.window, on_complete)
 
     def _sign_out(self) -> None:
         """Handle sign out from preferences."""
-        from core.google_auth import get_auth_manager
         auth_manager = get_auth_manager()
         auth_manager.sign_out()
-
-        # Refresh the preferences window
+        _invalidate_auth_status()
         if self.window:
-            self._close()
-            self.show(self._on_save)
+            self._refresh_auth_ui()
 
     def _browse_folder(self) -> None:
         """Open folder browser dialog."""
+        # Start from an existing folder so the native picker doesn't have
+        # to probe a stale path first
+        initial_dir = self.path_var.get()
+        if not initial_dir or not os.path.isdir(initial_dir):
+            initial_dir = str(Path.home())
+
         folder = filedialog.askdirectory(
             title="Select Download Location",
-            initialdir=self.path_var.get()
+            initialdir=initial_dir
         )
         if folder:
             self.path_var.set(folder)
@@ -353,18 +477,18 @@ class ConfigWindow:
     def _save(self) -> None:
         """Save configuration."""
         config_manager = get_config_manager()
+        current_config = config_manager.get_config()
 
-        new_config = AppConfig(
-            download_path=self.path_var.get(),
-            auto_download=self.auto_download_var.get(),
-            auto_transcribe=self.auto_transcribe_var.get(),
-            transcription_model=self.model_var.get(),
-            transcription_output_format=self.format_var.get(),
-            transcription_language=self.language_var.get(),
-            download_videos=self.videos_var.get(),
-            download_documents=self.documents_var.get(),
-            download_photos=self.photos_var.get()
-        )
+        # Settings without a widget (e.g. max_concurrent_downloads) are kept
+        new_config = replace(current_config, **{
+            field_name: getattr(self, attr).get()
+            for attr, _, field_name in self._SETTINGS
+        })
+
+        # Nothing changed: skip the disk write and the on_save refresh
+        if new_config == current_config:
+            self._close()
+            return
 
         config_manager.save_config(new_config)
         logger.info("Configuration saved")
@@ -375,14 +499,19 @@ class ConfigWindow:
         self._close()
 
     def _close(self) -> None:
-        """Close the window."""
+        """Hide the window; it is kept for reuse and destroyed with the app."""
         if self.window:
-            self.window.destroy()
-            self.window = None
+            self.window.withdraw()
+
+
+# Shared instance; reopening Preferences reshows the hidden window
+_config_window: Optional[ConfigWindow] = None
 
 
 def show_config_dialog(parent=None, on_save: Optional[Callable[[AppConfig], None]] = None) -> ConfigWindow:
     """Show the configuration dialog."""
-    window = ConfigWindow(parent)
-    window.show(on_save)
-    return window
+    global _config_window
+    if _config_window is None:
+        _config_window = ConfigWindow(parent)
+    _config_window.show(on_save)
+    return _config_window
@@ -17,8 +17,8 @@ except ImportError:
     from tkinter import ttk
     CTK_AVAILABLE = False
 
-from utils.logger import get_logger
-from utils.config import FileState, DownloadStats
+from ..utils.logger import get_logger
+from ..utils.config import FileState, DownloadStats
 
 logger = get_logger()
 
@@ -686,7 +686,7 @@ class MainWindow:
 
         # Get files from config manager
         try:
-            from utils.config import get_config_manager
+            from ..utils.config import get_config_manager
             config_manager = get_config_manager()
 
             all_files = []
@@ -729,7 +729,7 @@ class MainWindow:
 
     def _create_file_row(self, parent, file_state: FileState) -> None:
         """Create a row for a file in the downloads list."""
-        from utils.formatters import format_file_size
+        from ..utils.formatters import format_file_size
 
         row = ctk.CTkFrame(parent, fg_color=COLORS["bg_card"], corner_radius=10)
         row.pack(fill="x", pady=4)
@@ -889,7 +889,7 @@ class MainWindow:
         scroll_frame.pack(fill="both", expand=True)
 
         try:
-            from utils.config import get_config_manager
+            from ..utils.config import get_config_manager
             config_manager = get_config_manager()
             transcription_state = config_manager.get_transcription_state()
 
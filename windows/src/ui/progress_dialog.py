@@ -12,7 +12,7 @@ except ImportError:
     from tkinter import ttk
     CTK_AVAILABLE = False
 
-from utils.logger import get_logger
+from ..utils.logger import get_logger
 
 logger = get_logger()
 
@@ -12,7 +12,7 @@ from PIL import Image, ImageDraw
 import pystray
 from pystray import MenuItem as Item, Menu
 
-from utils.logger import get_logger
+from ..utils.logger import get_logger
 
 logger = get_logger()
 
@@ -4,10 +4,12 @@ Handles app settings and download/transcription state persistence.
 """
 
 import json
+import os
+import threading
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterable, Tuple
 
 from .paths import Paths
 from .logger import get_logger
@@ -15,6 +17,12 @@ from .logger import get_logger
 
 logger = get_logger()
 
+# Common video MIME types, checked before falling back to the "video/" prefix
+_VIDEO_MIME_TYPES = frozenset([
+    "video/mp4", "video/quicktime", "video/x-msvideo",
+    "video/webm", "video/3gpp", "video/mpeg", "video/x-matroska",
+])
+
 
 @dataclass
 class AppConfig:
@@ -25,6 +33,10 @@ class AppConfig:
     transcription_model: str = "small"
     transcription_output_format: str = "txt"  # txt, srt, vtt, both (txt + srt)
     transcription_language: str = "en"  # Language code or "auto" for auto-detect
+    transcription_compute_type: str = "auto"  # auto, int8, int8_float16, float16, bfloat16
+    transcription_cpu_threads: int = -1  # CPU inference threads, -1 = all cores but two
+    transcription_quantize_models: bool = False  # Build pre-quantized model copies (downloads the full checkpoint)
+    transcription_folder_language: bool = False  # With "auto", reuse the language detected per Drive folder
     download_videos: bool = True
     download_documents: bool = True
     download_photos: bool = True
@@ -36,9 +48,13 @@ class AppConfig:
             self.download_path = str(Paths.get_default_download_dir())
 
 
-@dataclass
+@dataclass(slots=True)
 class FileState:
-    """State of a single file (for download/transcription tracking)."""
+    """
+    State of a single file (for download/transcription tracking).
+
+    Uses __slots__, since a large backup keeps tens of thousands in memory.
+    """
     id: str
     name: str
     source: str  # 'drive' or 'photos'
@@ -49,15 +65,14 @@ class FileState:
     local_path: Optional[str] = None
     error_message: Optional[str] = None
     modified_time: Optional[str] = None
+    parent_id: Optional[str] = None  # Drive folder ID; None for Photos
     transcription_status: str = "pending"  # pending, transcribing, complete, error, n/a
     transcribed_at: Optional[str] = None
 
     @property
     def is_video(self) -> bool:
         """Check if this is a video file."""
-        video_types = ["video/mp4", "video/quicktime", "video/x-msvideo",
-                       "video/webm", "video/3gpp", "video/mpeg", "video/x-matroska"]
-        return self.mime_type in video_types or self.mime_type.startswith("video/")
+        return self.mime_type in _VIDEO_MIME_TYPES or self.mime_type.startswith("video/")
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -114,6 +129,27 @@ class ConfigManager:
         self._drive_sync_state: Optional[SyncState] = None
         self._photos_sync_state: Optional[SyncState] = None
 
+        # File IDs grouped by status per source, so status lookups don't have
+        # to scan every file. Dicts are used as insertion-ordered sets.
+        self._status_index: Dict[str, Dict[str, Dict[str, None]]] = {"drive": {}, "photos": {}}
+        self._indexed_status: Dict[str, Dict[str, str]] = {"drive": {}, "photos": {}}
+
+        # (source, file ID) by local path, for mapping a video back to its file
+        self._local_path_index: Dict[str, Tuple[str, str]] = {}
+        self._indexed_local_path: Dict[str, Dict[str, str]] = {"drive": {}, "photos": {}}
+
+        # Local paths of downloaded videos, the transcription candidates
+        self._video_paths: Dict[str, None] = {}
+
+        # Bumped on every file or transcription state change so callers can
+        # cache values derived from the state
+        self._state_version = 0
+        self._index_lock = threading.Lock()
+
+        # Serializes file state changes and saves; a scan storing files and
+        # the download worker flushing them can run at the same time
+        self._state_lock = threading.RLock()
+
     def get_config(self) -> AppConfig:
         """Get the current configuration, loading from disk if needed."""
         if self._config is None:
@@ -158,16 +194,29 @@ class ConfigManager:
         """Get Drive file states, loading from disk if needed."""
         if not self._drive_state:
             self._drive_state = self._load_state(Paths.get_drive_state_file())
+            self._rebuild_status_index("drive", self._drive_state)
         return self._drive_state
 
     def save_drive_state(self) -> None:
         """Save Drive state to disk."""
         self._save_state(self._drive_state, Paths.get_drive_state_file())
 
-    def update_drive_file(self, file_state: FileState) -> None:
-        """Update a single Drive file state."""
-        self._drive_state[file_state.id] = file_state
-        self.save_drive_state()
+    def update_drive_file(self, file_state: FileState, save: bool = True) -> None:
+        """Update a single Drive file state, optionally deferring the save."""
+        with self._state_lock:
+            self._drive_state[file_state.id] = file_state
+            self._index_files("drive", (file_state,))
+            if save:
+                self.save_drive_state()
+
+    def update_drive_files(self, file_states: Iterable[FileState], save: bool = True) -> None:
+        """Update many Drive file states at once."""
+        file_states = list(file_states)
+        with self._state_lock:
+            self._drive_state.update((f.id, f) for f in file_states)
+            self._index_files("drive", file_states)
+            if save:
+                self.save_drive_state()
 
     def update_drive_sync_time(self) -> None:
         """Update the last sync time for Drive."""
@@ -177,6 +226,37 @@ class ConfigManager:
         self._update_sync_counts("drive")
         self.save_drive_state()
 
+    def get_drive_changes_token(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the saved Drive changes token, if any.
+
+        Returns:
+            Dict with "token" and the include_videos/include_documents flags
+            of the scan it was taken for, or None
+        """
+        changes_file = Paths.get_drive_changes_file()
+        if not changes_file.exists():
+            return None
+
+        try:
+            with open(changes_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load Drive changes token: {e}")
+            return None
+
+    def save_drive_changes_token(self, changes: Optional[Dict[str, Any]]) -> None:
+        """Save the Drive changes token (None removes it)."""
+        changes_file = Paths.get_drive_changes_file()
+        try:
+            if changes is None:
+                changes_file.unlink(missing_ok=True)
+                return
+            with open(changes_file, "w", encoding="utf-8") as f:
+                json.dump(changes, f, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to save Drive changes token: {e}")
+
     def get_drive_sync_state(self) -> SyncState:
         """Get the Drive sync state."""
         if self._drive_sync_state is None:
@@ -188,16 +268,29 @@ class ConfigManager:
         """Get Photos file states, loading from disk if needed."""
         if not self._photos_state:
             self._photos_state = self._load_state(Paths.get_photos_state_file())
+            self._rebuild_status_index("photos", self._photos_state)
         return self._photos_state
 
     def save_photos_state(self) -> None:
         """Save Photos state to disk."""
         self._save_state(self._photos_state, Paths.get_photos_state_file())
 
-    def update_photos_file(self, file_state: FileState) -> None:
-        """Update a single Photos file state."""
-        self._photos_state[file_state.id] = file_state
-        self.save_photos_state()
+    def update_photos_file(self, file_state: FileState, save: bool = True) -> None:
+        """Update a single Photos file state, optionally deferring the save."""
+        with self._state_lock:
+            self._photos_state[file_state.id] = file_state
+            self._index_files("photos", (file_state,))
+            if save:
+                self.save_photos_state()
+
+    def update_photos_files(self, file_states: Iterable[FileState], save: bool = True) -> None:
+        """Update many Photos file states at once."""
+        file_states = list(file_states)
+        with self._state_lock:
+            self._photos_state.update((f.id, f) for f in file_states)
+            self._index_files("photos", file_states)
+            if save:
+                self.save_photos_state()
 
     def update_photos_sync_time(self) -> None:
         """Update the last sync time for Photos."""
@@ -213,6 +306,96 @@ class ConfigManager:
             self._photos_sync_state = SyncState()
         return self._photos_sync_state
 
+    # Status index
+    def _index_files(self, source: str, file_states: Iterable[FileState]) -> None:
+        """Record the current status of files in the status index."""
+        index = self._status_index[source]
+        indexed_status = self._indexed_status[source]
+        indexed_local_path = self._indexed_local_path[source]
+
+        with self._index_lock:
+            self._state_version += 1
+            for file_state in file_states:
+                old_path = indexed_local_path.get(file_state.id)
+                if old_path != file_state.local_path:
+                    if old_path is not None:
+                        self._local_path_index.pop(old_path, None)
+                        self._video_paths.pop(old_path, None)
+                        del indexed_local_path[file_state.id]
+                    if file_state.local_path:
+                        self._local_path_index[file_state.local_path] = (source, file_state.id)
+                        indexed_local_path[file_state.id] = file_state.local_path
+
+                if file_state.local_path:
+                    if file_state.status == "complete" and file_state.mime_type.startswith("video/"):
+                        self._video_paths[file_state.local_path] = None
+                    else:
+                        self._video_paths.pop(file_state.local_path, None)
+
+                old_status = indexed_status.get(file_state.id)
+                if old_status == file_state.status:
+                    continue
+                if old_status is not None:
+                    index[old_status].pop(file_state.id, None)
+                index.setdefault(file_state.status, {})[file_state.id] = None
+                indexed_status[file_state.id] = file_state.status
+
+    def _rebuild_status_index(self, source: str, files: Dict[str, FileState]) -> None:
+        """Rebuild the status index for a source from scratch."""
+        with self._index_lock:
+            self._status_index[source] = {}
+            self._indexed_status[source] = {}
+            for local_path in self._indexed_local_path[source].values():
+                self._local_path_index.pop(local_path, None)
+                self._video_paths.pop(local_path, None)
+            self._indexed_local_path[source] = {}
+        self._index_files(source, files.values())
+
+    def get_files_with_status(self, status: str) -> List[FileState]:
+        """Get all Drive and Photos files with the given status."""
+        drive_state = self.get_drive_state()
+        photos_state = self.get_photos_state()
+
+        with self._index_lock:
+            drive_ids = list(self._status_index["drive"].get(status, ()))
+            photos_ids = list(self._status_index["photos"].get(status, ()))
+
+        return [drive_state[i] for i in drive_ids] + [photos_state[i] for i in photos_ids]
+
+    @property
+    def state_version(self) -> int:
+        """Counter that changes whenever file or transcription state changes."""
+        return self._state_version
+
+    def get_downloaded_video_paths(self) -> List[str]:
+        """Get local paths of all completely downloaded videos."""
+        self.get_drive_state()
+        self.get_photos_state()
+
+        with self._index_lock:
+            return list(self._video_paths)
+
+    def find_file_by_local_path(self, local_path: str) -> Optional[Tuple[str, FileState]]:
+        """
+        Find the file downloaded to a local path.
+
+        Returns:
+            Tuple of (source, FileState) where source is "drive" or "photos",
+            or None if no file has that path
+        """
+        states = {"drive": self.get_drive_state(), "photos": self.get_photos_state()}
+
+        with self._index_lock:
+            entry = self._local_path_index.get(local_path)
+
+        if entry is None:
+            return None
+        source, file_id = entry
+        file_state = states[source].get(file_id)
+        if file_state is None:
+            return None
+        return source, file_state
+
     def _update_sync_counts(self, source: str) -> None:
         """Update sync counts for a source."""
         if source == "drive":
@@ -241,14 +424,15 @@ class ConfigManager:
         state_file = Paths.get_transcription_state_file()
         try:
             data = {k: v.to_dict() for k, v in self._transcription_state.items()}
-            with open(state_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            _write_json_atomic(state_file, data)
         except Exception as e:
             logger.error(f"Failed to save transcription state: {e}")
 
     def update_transcription(self, state: TranscriptionState) -> None:
         """Update a single transcription state."""
         self._transcription_state[state.video_path] = state
+        with self._index_lock:
+            self._state_version += 1
         self.save_transcription_state()
 
     def _load_transcription_state(self) -> Dict[str, TranscriptionState]:
@@ -282,9 +466,11 @@ class ConfigManager:
     def _save_state(self, state: Dict[str, FileState], state_file: Path) -> None:
         """Save file states to disk."""
         try:
-            data = {k: v.to_dict() for k, v in state.items()}
-            with open(state_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            # Held while writing too, so concurrent saves can't interleave or
+            # an older snapshot overwrite a newer one
+            with self._state_lock:
+                data = {k: v.to_dict() for k, v in state.items()}
+                _write_json_atomic(state_file, data)
         except Exception as e:
             logger.error(f"Failed to save state to {state_file}: {e}")
 
@@ -331,22 +517,44 @@ class ConfigManager:
 
     def clear_all_state(self) -> None:
         """Clear all download and transcription state."""
-        self._drive_state = {}
-        self._photos_state = {}
-        self._transcription_state = {}
-        self.save_drive_state()
-        self.save_photos_state()
-        self.save_transcription_state()
+        with self._state_lock:
+            self._drive_state = {}
+            self._photos_state = {}
+            self._transcription_state = {}
+            self._rebuild_status_index("drive", self._drive_state)
+            self._rebuild_status_index("photos", self._photos_state)
+            self.save_drive_state()
+            self.save_photos_state()
+            self.save_transcription_state()
+        # Without the file states a changes-only scan would miss everything
+        self.save_drive_changes_token(None)
         logger.info("Cleared all state")
 
 
-# Singleton instance
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """
+    Write data as JSON to a temporary file, then replace path with it.
+
+    A crash or failed write leaves the previous file intact instead of a
+    truncated one that would load as empty state.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# Singleton instance; created under a lock since worker threads can ask
+# for it at the same time as the UI thread
 _config_manager: Optional[ConfigManager] = None
+_config_manager_lock = threading.Lock()
 
 
 def get_config_manager() -> ConfigManager:
     """Get the global ConfigManager instance."""
     global _config_manager
     if _config_manager is None:
-        _config_manager = ConfigManager()
+        with _config_manager_lock:
+            if _config_manager is None:
+                _config_manager = ConfigManager()
     return _config_manager
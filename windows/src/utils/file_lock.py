@@ -0,0 +1,82 @@
+"""
+Cross-process file locking.
+Used where several app processes may touch the same files on disk.
+"""
+
+import errno
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from .logger import get_logger
+
+logger = get_logger()
+
+# Seconds between attempts while another process holds the lock
+LOCK_POLL_INTERVAL = 0.1
+
+# errno values meaning the lock is held by someone else
+_LOCK_BUSY = frozenset([errno.EACCES, errno.EAGAIN, errno.EWOULDBLOCK, errno.EDEADLK])
+
+
+@contextmanager
+def file_lock(lock_file: Path, timeout: Optional[float] = None):
+    """
+    Hold an OS-level exclusive lock on lock_file for the duration of the block.
+
+    Waits until the lock is free, or at most timeout seconds if given (pass
+    one on the UI thread, so a hung process holding the lock can't freeze
+    it). If the lock can't be taken or the wait times out, the block still
+    runs, unlocked.
+
+    Yields:
+        True if the lock is held
+    """
+    with open(lock_file, "a+b") as f:
+        locked = False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    _try_lock(f)
+                    locked = True
+                    break
+                except OSError as e:
+                    if e.errno not in _LOCK_BUSY:
+                        raise
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.warning(f"Timed out waiting for lock on {lock_file.name}")
+                    break
+                time.sleep(LOCK_POLL_INTERVAL)
+        except OSError as e:
+            logger.warning(f"Could not lock {lock_file.name}: {e}")
+
+        try:
+            yield locked
+        finally:
+            if locked:
+                _unlock(f)
+
+
+def _try_lock(f) -> None:
+    """Take the lock without waiting; raises OSError if it is held elsewhere."""
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock(f) -> None:
+    """Release a lock taken by _try_lock."""
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
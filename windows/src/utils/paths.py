@@ -126,6 +126,11 @@ class Paths:
         """Get the Photos state file path."""
         return cls.get_state_dir() / "photos_state.json"
 
+    @classmethod
+    def get_drive_changes_file(cls) -> Path:
+        """Get the Drive changes token file path."""
+        return cls.get_state_dir() / "drive_changes.json"
+
     @classmethod
     def get_transcription_state_file(cls) -> Path:
         """Get the transcription state file path."""